@@ -0,0 +1,39 @@
+"""
+Lad sweeper, a minesweeper game, solvers and grid generators
+
+The main classes can be had from here, but each module is only
+imported the first time one of its names is used, so
+>>> import sweeper
+>>> game = sweeper.LadSweeper((16, 30), 99)
+
+costs no more than importing the engine itself, and tkinter and
+PIL are only loaded by the GUI names.
+"""
+from importlib import import_module
+
+# Name to the module it lives in
+_LAZY = {
+    "LadSweeper": "sweeper.lad_sweeper",
+    "VectorLadSweeper": "sweeper.vector_lad_sweeper",
+    "GridGenerator": "sweeper.data.grid_generator",
+    "ParallelGridGenerator": "sweeper.data.parallel",
+    "BoardPool": "sweeper.data.board_pool",
+    "GridDataset": "sweeper.data.grid_dataset",
+    "write_grid_dataset": "sweeper.data.grid_dataset",
+    "Player": "sweeper.solver.player",
+    "LadSweeperApp": "sweeper.gui.gui",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY[name]), name)
+    globals()[name] = value #  only looked up once
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
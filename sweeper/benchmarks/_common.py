@@ -0,0 +1,33 @@
+"""
+Helpers shared by the benchmarks, and the `sweeper` command
+"""
+import argparse
+from time import perf_counter
+import tracemalloc
+from typing import Callable, Tuple
+
+
+def parse_shape(text: str) -> Tuple[int, int]:
+    """'16x30' -> (16, 30), for argparse"""
+    try:
+        rows, columns = (int(n) for n in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shape must be ROWSxCOLUMNS, not {text!r}")
+    return rows, columns
+
+
+def measure(run: Callable[[], object], repeats: int = 3) -> Tuple[float, int]:
+    """
+    Return the best time over `repeats` calls of `run` and the peak
+    memory allocated by one call, in bytes
+    """
+    times = []
+    for _ in range(repeats):
+        start = perf_counter()
+        run()
+        times.append(perf_counter() - start)
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak
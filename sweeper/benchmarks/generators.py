@@ -0,0 +1,226 @@
+"""
+Benchmark grid generator backends over numbers of grids, board shapes and mine densities
+
+This is the comparison from `research/grid_gen_methods.ipynb`, made
+repeatable. Each backend is registered with `register` and every
+case records throughput and peak memory (from tracemalloc). The
+results saved with `--output` are the baseline for later runs:
+any case more than `--tolerance` slower, or using that much more
+memory, fails the run with exit code 1. Timings depend on the
+machine, so keep one baseline per machine.
+
+Run with:
+    python -m sweeper.benchmarks.generators --output baseline.json
+    python -m sweeper.benchmarks.generators --baseline baseline.json
+    python -m sweeper.benchmarks.generators --backends current sparse \\
+        --grids 100000 --shapes 16x30 --densities 0.2
+"""
+import argparse
+import json
+import sys
+from random import Random
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+
+from sweeper.benchmarks._common import measure, parse_shape
+from sweeper.benchmarks.neighbour_counting import strided_count_neighbours
+from sweeper.data.grid_generator import GridGenerator
+from sweeper.data.indexed_generator import IndexedGridGenerator
+from sweeper.reveal import neighbour_table
+
+# name: (factory(shape, num_mines, seed), most cells it's run on)
+BACKENDS: Dict[str, Tuple[Callable, int | None]] = {}
+
+
+def register(name: str, max_cells: int | None = None):
+    """
+    Add a backend to `BACKENDS`. The decorated function takes
+    (shape, num_mines, seed) and returns an object with a
+    `generate_n_grids(N)` method. Slow backends can set
+    `max_cells`, the most grids * cells they are timed on
+    """
+    def decorator(factory: Callable) -> Callable:
+        BACKENDS[name] = (factory, max_cells)
+        return factory
+    return decorator
+
+
+class StridedGridGenerator(GridGenerator):
+    """
+    Shuffled coordinates counted with the original padded
+    `as_strided` kernel (GridGenerator3 in the notebook)
+    """
+    def generate_n_grids(self, N: int) -> np.ndarray:
+        return strided_count_neighbours(self.generate_n_mined_boards(N))
+
+
+class FancyIndexGridGenerator(GridGenerator):
+    """
+    Count mines by fancy indexing every cell's neighbours out of
+    the flattened boards (GridGenerator4 in the notebook)
+    """
+    def generate_n_grids(self, N: int) -> np.ndarray:
+        boards = self.generate_n_mined_boards(N).reshape(N, self.size)
+        # Off board neighbours point at a column of 0s on the end
+        padded = np.zeros((N, self.size + 1), dtype=np.int8)
+        padded[:, :-1] = boards
+        table = neighbour_table(self.grid_shape)
+        counts = -padded[:, table].sum(axis=2, dtype=np.int8)
+        np.copyto(counts, -1, where=boards < 0)
+        return counts.reshape(N, *self.grid_shape)
+
+
+class PythonGridGenerator:
+    """
+    Lists and loops with no numpy (GridGenerator5 in the notebook)
+    """
+    NEIGHBOURS = tuple((i, j) for i in (-1, 0, 1) for j in (-1, 0, 1)
+                       if not i == j == 0)
+
+    def __init__(self, grid_shape, num_mines, seed=None):
+        self.rows, self.columns = grid_shape
+        self.num_mines = num_mines
+        self.random = Random(seed)
+        self.coords = [(i, j) for i in range(self.rows)
+                       for j in range(self.columns)]
+
+    def generate_grid(self) -> List[List[int]]:
+        grid = [[0] * self.columns for _ in range(self.rows)]
+        for i, j in self.random.sample(self.coords, self.num_mines):
+            grid[i][j] = -1
+        for i in range(self.rows):
+            for j in range(self.columns):
+                if grid[i][j] < 0:
+                    continue
+                grid[i][j] = sum(grid[i + y][j + x] < 0 for y, x in self.NEIGHBOURS
+                                 if 0 <= i + y < self.rows and 0 <= j + x < self.columns)
+        return grid
+
+    def generate_n_grids(self, N: int) -> List[List[List[int]]]:
+        return [self.generate_grid() for _ in range(N)]
+
+
+@register("current")
+def current(shape, num_mines, seed):
+    return GridGenerator(shape, num_mines, seed=seed)
+
+
+@register("permute")
+def permute(shape, num_mines, seed):
+    return GridGenerator(shape, num_mines, seed=seed, sampler="permute")
+
+
+@register("sparse")
+def sparse(shape, num_mines, seed):
+    return GridGenerator(shape, num_mines, seed=seed, sampler="sparse")
+
+
+@register("philox")
+def philox(shape, num_mines, seed):
+    return IndexedGridGenerator(shape, num_mines, seed=seed)
+
+
+@register("strided", max_cells=10**8)
+def strided(shape, num_mines, seed):
+    return StridedGridGenerator(shape, num_mines, seed=seed, sampler="permute")
+
+
+@register("fancy", max_cells=10**8)
+def fancy(shape, num_mines, seed):
+    return FancyIndexGridGenerator(shape, num_mines, seed=seed, sampler="permute")
+
+
+@register("python", max_cells=10**6)
+def python(shape, num_mines, seed):
+    return PythonGridGenerator(shape, num_mines, seed=seed)
+
+
+def case_key(backend: str, N: int, shape: Tuple[int, int], num_mines: int) -> str:
+    return f"{backend} N={N} {shape[0]}x{shape[1]} mines={num_mines}"
+
+
+def compare(results: List[Dict], baseline: Dict[str, Dict],
+            tolerance: float) -> List[str]:
+    """
+    Return a line for every result slower, or using more memory,
+    than its baseline by more than `tolerance`
+    """
+    regressions = []
+    for result in results:
+        before = baseline.get(result["case"])
+        if before is None:
+            continue
+        speed = result["grids_per_second"] / before["grids_per_second"]
+        memory = result["peak_bytes"] / max(before["peak_bytes"], 1)
+        if speed < 1 - tolerance:
+            regressions.append(f"{result['case']}: {speed:.2f}x the baseline throughput")
+        if memory > 1 + tolerance:
+            regressions.append(f"{result['case']}: {memory:.2f}x the baseline peak memory")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS),
+                        choices=list(BACKENDS))
+    parser.add_argument("--grids", nargs="+", type=int, default=[1000, 100_000])
+    parser.add_argument("--shapes", nargs="+", type=parse_shape,
+                        default=[(9, 9), (16, 30), (50, 50)])
+    parser.add_argument("--densities", nargs="+", type=float,
+                        default=[0.12, 0.2, 0.3])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results here as JSON")
+    parser.add_argument("--baseline", help="baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed fractional slowdown or memory growth")
+    args = parser.parse_args()
+
+    print(f"{'backend':>8} {'N':>8} {'shape':>10} {'mines':>7} {'time (s)':>10} "
+          f"{'grids/s':>10} {'peak MiB':>9}")
+    results = []
+    for shape in args.shapes:
+        size = shape[0] * shape[1]
+        for density in args.densities:
+            num_mines = max(1, round(density * size))
+            for N in args.grids:
+                for name in args.backends:
+                    factory, max_cells = BACKENDS[name]
+                    if max_cells is not None and N * size > max_cells:
+                        continue
+                    generator = factory(shape, num_mines, args.seed)
+                    generator.generate_n_grids(min(N, 16)) #  warm up
+                    elapsed, peak = measure(lambda: generator.generate_n_grids(N),
+                                            args.repeats)
+                    results.append({
+                        "case": case_key(name, N, shape, num_mines),
+                        "backend": name,
+                        "N": N,
+                        "shape": list(shape),
+                        "num_mines": num_mines,
+                        "seconds": elapsed,
+                        "grids_per_second": N / elapsed,
+                        "peak_bytes": peak,
+                    })
+                    print(f"{name:>8} {N:>8} {f'{shape[0]}x{shape[1]}':>10} "
+                          f"{num_mines:>7} {elapsed:>10.4f} {N / elapsed:>10.3g} "
+                          f"{peak / 2**20:>9.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({result["case"]: result for result in results}, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"no regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+CPU used by an open game window sitting idle with its clock running
+
+A game window and a running Clock are left alone for `--seconds`,
+and the process CPU time and number of clock wakeups over that time
+are reported. For comparison the same is done with a callback
+polling every `--poll-ms` as the clock used to. Needs a display:
+    python -m sweeper.benchmarks.gui_idle --seconds 10
+"""
+import argparse
+from time import monotonic, process_time
+
+import tkinter as tk
+
+from sweeper.gui.clock import Clock
+from sweeper.gui.gui import LadSweeperApp
+from sweeper.gui.segment_digit import Digit
+
+
+def measure(seconds: float, poll_ms: int | None, renderer: str) -> tuple[float, int]:
+    """
+    Returns
+    -------
+    cpu, wakeups:
+        Fraction of one core used, and how often the clock (or the
+        polling callback) ran
+    """
+    root = tk.Tk()
+    app = LadSweeperApp(root, renderer=renderer)
+    clock = Clock(app.banner)
+    clock.pack()
+    root.update()
+
+    wakeups = 0
+    update_timer = clock.update_timer
+    def counted():
+        nonlocal wakeups
+        wakeups += 1
+        update_timer()
+    clock.update_timer = counted
+
+    if poll_ms is not None:
+        def poll(): #  the old clock: redraw every poll_ms
+            nonlocal wakeups
+            wakeups += 1
+            text = f"{min(int(monotonic() - start), 999):03d}"
+            # Every segment is repainted on every tick, as the old
+            # `Digit.set_value` did, rather than only those that change
+            for digit, char in zip(clock.digits, text):
+                for i, lit in enumerate(Digit.NUMBERS[char], 1):
+                    digit.itemconfig(i, fill=Digit.ON_COLOUR if lit
+                                     else Digit.OFF_COLOUR)
+            root.after(poll_ms, poll)
+        start = monotonic()
+        root.after(poll_ms, poll)
+    else:
+        clock.start_timer()
+
+    root.after(int(seconds * 1000), root.quit)
+    cpu = process_time()
+    root.mainloop()
+    cpu = process_time() - cpu
+    clock.stop_timer()
+    root.destroy()
+    return cpu / seconds, wakeups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--poll-ms", type=int, default=10,
+                        help="period of the polling clock compared against")
+    parser.add_argument("--renderer", choices=LadSweeperApp.RENDERERS,
+                        default="canvas")
+    args = parser.parse_args()
+
+    print(f"{'clock':>12} {'CPU':>7} {'wakeups/s':>10}")
+    for name, poll_ms in (("event", None), (f"poll {args.poll_ms}ms", args.poll_ms)):
+        cpu, wakeups = measure(args.seconds, poll_ms, args.renderer)
+        print(f"{name:>12} {cpu:>7.2%} {wakeups / args.seconds:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
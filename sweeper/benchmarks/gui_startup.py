@@ -0,0 +1,78 @@
+"""
+Startup and new game times of the GUI's "buttons" and "canvas" renderers
+
+Each window is built, a game is played until a region is open so the
+reset has cells to put back, and then new games are timed. Every time
+includes drawing the window. Needs a display, run with:
+    python -m sweeper.benchmarks.gui_startup --shapes 16x30 50x50
+"""
+import argparse
+from time import perf_counter
+
+import numpy as np
+import tkinter as tk
+
+from sweeper.benchmarks._common import parse_shape
+from sweeper.gui.gui import LadSweeperApp
+
+
+def open_region(app: LadSweeperApp) -> None:
+    """Click a 0 of the board, so the next new game has cells to reset"""
+    zeros = np.argwhere(app.game._board == 0)
+    if len(zeros):
+        app.on_click(tuple(zeros[0].tolist()))
+
+
+def time_renderer(shape, num_mines: int, renderer: str,
+                  games: int) -> tuple[float, float]:
+    """
+    Returns
+    -------
+    startup, new_game: float
+        Seconds to build and draw the window, and the median to
+        start a new game
+    """
+    root = tk.Tk()
+    try:
+        start = perf_counter()
+        app = LadSweeperApp(root, shape, num_mines, renderer=renderer)
+        root.update()
+        startup = perf_counter() - start
+
+        times = []
+        for _ in range(games):
+            open_region(app)
+            root.update()
+            start = perf_counter()
+            app.new_game()
+            root.update()
+            times.append(perf_counter() - start)
+    finally:
+        root.destroy()
+    return startup, float(np.median(times))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shapes", nargs="+", type=parse_shape,
+                        default=[(16, 30), (50, 50)],
+                        help="rows x columns, e.g. 16x30")
+    parser.add_argument("--density", type=float, default=0.2,
+                        help="fraction of cells that are mines")
+    parser.add_argument("--renderers", nargs="+", default=LadSweeperApp.RENDERERS,
+                        choices=LadSweeperApp.RENDERERS)
+    parser.add_argument("--games", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'shape':>10} {'renderer':>9} {'startup [s]':>12} {'new game [s]':>13}")
+    for shape in args.shapes:
+        text = f"{shape[0]}x{shape[1]}"
+        num_mines = max(1, round(args.density * shape[0] * shape[1]))
+        for renderer in args.renderers:
+            startup, new_game = time_renderer(shape, num_mines, renderer,
+                                              args.games)
+            print(f"{text:>10} {renderer:>9} {startup:>12.3f} {new_game:>13.4f}")
+
+
+if __name__ == "__main__":
+    main()
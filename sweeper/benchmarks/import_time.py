@@ -0,0 +1,66 @@
+"""
+Check the headless import path stays quick and free of GUI modules
+
+Each measurement is a fresh interpreter that imports numpy, then
+`sweeper` and the engine classes, timing the two separately. The
+best of `--repeats` runs of sweeper's own share (on top of numpy,
+which every user pays anyway) is compared to `--budget`, and any
+of the GUI modules being loaded is a failure. Exits with code 1 on
+either, so it can gate CI:
+    python -m sweeper.benchmarks.import_time --budget 0.05
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# Must not be imported on the headless path
+GUI_MODULES = ("tkinter", "PIL")
+
+CHILD = """
+import json, sys
+from time import perf_counter
+start = perf_counter()
+import numpy
+middle = perf_counter()
+import sweeper
+sweeper.LadSweeper, sweeper.GridGenerator
+end = perf_counter()
+print(json.dumps({"numpy": middle - start, "sweeper": end - middle,
+                  "gui": [name for name in %r if name in sys.modules]}))
+""" % (GUI_MODULES,)
+
+
+def measure() -> dict:
+    """Import times, in seconds, from a fresh interpreter"""
+    output = subprocess.run([sys.executable, "-c", CHILD], check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget", type=float, default=0.05,
+                        help="seconds allowed for importing sweeper after numpy")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    runs = [measure() for _ in range(args.repeats)]
+    numpy_time = min(run["numpy"] for run in runs)
+    sweeper_time = min(run["sweeper"] for run in runs)
+    gui = sorted({name for run in runs for name in run["gui"]})
+    print(f"numpy {numpy_time * 1e3:.1f} ms, sweeper {sweeper_time * 1e3:.1f} ms "
+          f"(budget {args.budget * 1e3:.0f} ms)")
+
+    failed = False
+    if sweeper_time > args.budget:
+        print("over budget")
+        failed = True
+    if gui:
+        print(f"GUI modules imported: {', '.join(gui)}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
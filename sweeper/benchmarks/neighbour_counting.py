@@ -0,0 +1,60 @@
+"""
+Compare the shifted slice `count_neighbours` kernel with the
+original padded `as_strided` kernel
+
+Run with:
+    python -m sweeper.benchmarks.neighbour_counting
+"""
+import argparse
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from sweeper.benchmarks._common import measure
+from sweeper.data.grid_generator import GridGenerator, count_neighbours
+
+
+def strided_count_neighbours(mined_grids: np.ndarray) -> np.ndarray:
+    """
+    The original kernel: sum a 5D strided view of a padded copy
+    """
+    N, rows, columns = mined_grids.shape
+    padded = np.zeros((N, rows + 2, columns + 2), dtype=np.int8)
+    padded[:, 1:-1, 1:-1] = mined_grids
+    strides = (padded.strides[0],) + padded.strides[1:] * 2
+    neighbours = as_strided(padded, (N, rows, columns, 3, 3), strides)
+    counts = np.abs(np.sum(neighbours, axis=(-1, -2)))
+    return np.where(mined_grids == -1, -1, counts)
+
+
+KERNELS = {"strided": strided_count_neighbours,
+           "shifted": count_neighbours}
+
+# (N, shape, mines)
+CASES = ((100_000, (16, 30), 99),
+         (10_000, (50, 50), 500),
+         (100, (1000, 1000), 150_000),
+         (4, (4000, 4000), 2_400_000))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'N':>8} {'shape':>12} {'kernel':>8} {'time (s)':>10} "
+          f"{'cells/s':>10} {'peak MiB':>9}")
+    for N, shape, mines in CASES:
+        generator = GridGenerator(shape, mines, seed=0)
+        mined_grids = generator.generate_n_mined_boards(N)
+        results = {}
+        for name, kernel in KERNELS.items():
+            results[name] = kernel(mined_grids)
+            elapsed, peak = measure(lambda: kernel(mined_grids), args.repeats)
+            print(f"{N:>8} {str(shape):>12} {name:>8} {elapsed:>10.4f} "
+                  f"{N * generator.size / elapsed:>10.2e} {peak / 2**20:>9.1f}")
+        assert np.array_equal(*results.values())
+
+
+if __name__ == "__main__":
+    main()
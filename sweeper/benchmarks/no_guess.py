@@ -0,0 +1,42 @@
+"""
+Time no-guess grid generation and report the acceptance rate
+
+Run with:
+    python -m sweeper.benchmarks.no_guess --grids 20000 --workers 8
+"""
+import argparse
+import os
+from time import perf_counter
+
+from sweeper.data.parallel import ParallelGridGenerator
+from sweeper.lad_sweeper import LadSweeper
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--grids", type=int, default=5000)
+    parser.add_argument("--presets", nargs="*", default=list(LadSweeper.PRESETS),
+                        choices=list(LadSweeper.PRESETS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.grids} no-guess grids, {args.workers} workers")
+    print(f"{'preset':>13} {'time (s)':>10} {'grids/s':>10} {'tried/s':>10} "
+          f"{'accepted':>9}")
+    for name in args.presets:
+        shape, num_mines = LadSweeper.PRESETS[name]
+        with ParallelGridGenerator(shape, num_mines, seed=args.seed,
+                                   workers=args.workers) as gen:
+            gen.generate_n_no_guess(args.workers) #  start the pool
+            gen.no_guess_attempts = gen.no_guess_accepted = 0
+            start = perf_counter()
+            gen.generate_n_no_guess(args.grids)
+            elapsed = perf_counter() - start
+        print(f"{name:>13} {elapsed:>10.3f} {args.grids / elapsed:>10.0f} "
+              f"{gen.no_guess_attempts / elapsed:>10.0f} "
+              f"{gen.acceptance_rate:>9.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Time ParallelGridGenerator.generate_n_grids for 1..N workers
+
+Run with:
+    python -m sweeper.benchmarks.parallel_scaling --grids 1000000
+"""
+import argparse
+import os
+from time import perf_counter
+
+from sweeper.data.parallel import ParallelGridGenerator
+
+
+def time_workers(workers: int, N: int, shape, num_mines: int,
+                 repeats: int = 3) -> float:
+    """
+    Return the best of `repeats` times to make N grids. The pool
+    is warmed up first so process start up isn't counted
+    """
+    with ParallelGridGenerator(shape, num_mines, seed=0,
+                               workers=workers) as gen:
+        gen.generate_n_grids(gen.block_size * workers)
+        times = []
+        for _ in range(repeats):
+            start = perf_counter()
+            gen.generate_n_grids(N)
+            times.append(perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--grids", type=int, default=200_000)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--columns", type=int, default=30)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    shape = (args.rows, args.columns)
+    print(f"{args.grids} grids of {shape} with {args.mines} mines, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'workers':>8} {'time (s)':>10} {'grids/s':>12} {'speedup':>8}")
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        elapsed = time_workers(workers, args.grids, shape, args.mines)
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>10.3f} {args.grids / elapsed:>12.0f} "
+              f"{baseline / elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Consumer throughput of a BoardService for different numbers of producers
+
+Each consumer process reads batches for a fixed time and touches
+every grid (a sum over the batch), as a training loop would. Run with:
+    python -m sweeper.benchmarks.ring_buffer --producers 1 2 4 --consumers 2
+"""
+import argparse
+import multiprocessing as mp
+import queue
+from time import perf_counter
+
+from sweeper.data.ring_buffer import BoardRing, BoardService
+
+
+def consume(ring: BoardRing, seconds: float, results: mp.Queue) -> None:
+    """Consumer process: read batches for `seconds`, report the grids read"""
+    grids = 0
+    end = perf_counter() + seconds
+    try:
+        while perf_counter() < end:
+            try:
+                with ring.batch(timeout=0.1) as batch:
+                    batch.sum()
+                    grids += len(batch)
+            except queue.Empty:
+                continue
+    finally:
+        ring.close()
+    results.put(grids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--producers", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--consumers", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--rows", type=int, default=16)
+    parser.add_argument("--columns", type=int, default=30)
+    parser.add_argument("--mines", type=int, default=99)
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--slots", type=int, default=16)
+    parser.add_argument("--policy", default="block", choices=BoardRing.POLICIES)
+    args = parser.parse_args()
+
+    shape = (args.rows, args.columns)
+    print(f"{args.consumers} consumers, {shape} grids with {args.mines} mines, "
+          f"batches of {args.batch_size}, {args.slots} slots, {args.policy}")
+    print(f"{'producers':>9} {'grids/s':>10} {'produced':>9} {'consumed':>9} "
+          f"{'dropped':>8}")
+    for producers in args.producers:
+        with BoardService(shape, args.mines, producers, seed=0,
+                          batch_size=args.batch_size, slots=args.slots,
+                          policy=args.policy) as service:
+            ring = service.ring
+            results = mp.Queue()
+            consumers = [mp.Process(target=consume,
+                                    args=(ring, args.seconds, results))
+                         for _ in range(args.consumers)]
+            for consumer in consumers:
+                consumer.start()
+            grids = sum(results.get() for _ in consumers)
+            for consumer in consumers:
+                consumer.join()
+            print(f"{producers:>9} {grids / args.seconds:>10.0f} "
+                  f"{ring.produced.value:>9} {ring.consumed.value:>9} "
+                  f"{ring.dropped.value:>8}")
+
+
+if __name__ == "__main__":
+    main()
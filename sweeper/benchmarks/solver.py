@@ -0,0 +1,166 @@
+"""
+Play many games with the solver and report its strength and speed as JSON
+
+Every game is played by `sweeper.solver.player.Player` on boards
+from seeded `LadSweeper` games, spread over a process pool. Games
+are handed out in fixed size tasks, each with its own seed
+spawned from `--seed`, so the results don't depend on the number
+of workers.
+
+Run with:
+    python -m sweeper.benchmarks.solver --games 1000 --output solver.json
+    python -m sweeper.benchmarks.solver --presets expert --custom 30 30 150
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from math import sqrt
+from statistics import NormalDist
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from sweeper.lad_sweeper import LadSweeper
+from sweeper.solver.player import Player
+
+GAMES_PER_TASK = 25
+
+
+def wilson_interval(wins: int, games: int,
+                    confidence: float = 0.95) -> Tuple[float, float]:
+    """
+    Wilson score interval for a win rate, which unlike the normal
+    approximation stays inside [0, 1] for rates near 0 or 1
+    """
+    if games == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    rate = wins / games
+    denominator = 1 + z**2 / games
+    centre = (rate + z**2 / (2 * games)) / denominator
+    spread = z * sqrt(rate * (1 - rate) / games + z**2 / (4 * games**2)) / denominator
+    return max(0.0, centre - spread), min(1.0, centre + spread)
+
+
+def play_games(shape: Tuple[int, int], num_mines: int, num_games: int,
+               seed: np.random.SeedSequence) -> Dict:
+    """
+    Play `num_games` games in one process and return their totals
+    """
+    start = perf_counter()
+    game = LadSweeper(shape, num_mines, seed=seed)
+    generation = perf_counter() - start
+
+    totals = {"wins": 0, "clicks": 0, "guesses": 0,
+              "generation": 0.0, "reveal": 0.0, "solve": 0.0}
+    move_times = []
+    for index in range(num_games):
+        if index:
+            start = perf_counter()
+            game.new_game()
+            generation = perf_counter() - start
+        player = Player(game)
+        totals["wins"] += bool(player.play())
+        totals["clicks"] += player.clicks
+        totals["guesses"] += player.guesses
+        totals["generation"] += generation
+        totals["reveal"] += player.timings["reveal"]
+        totals["solve"] += player.timings["solve"]
+        move_times.extend(player.move_times)
+    totals["move_times"] = np.array(move_times)
+    return totals
+
+
+def run(name: str, shape: Tuple[int, int], num_mines: int, games: int,
+        seed: int, pool: ProcessPoolExecutor, workers: int,
+        confidence: float) -> Dict:
+    """Play `games` games of one board type and summarise them"""
+    tasks = [GAMES_PER_TASK] * (games // GAMES_PER_TASK)
+    if games % GAMES_PER_TASK:
+        tasks.append(games % GAMES_PER_TASK)
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+
+    start = perf_counter()
+    results = list(pool.map(play_games, [shape] * len(tasks),
+                            [num_mines] * len(tasks), tasks, seeds))
+    wall_time = perf_counter() - start
+
+    def total(key: str):
+        return sum(result[key] for result in results)
+    wins, clicks = total("wins"), total("clicks")
+    move_times = np.concatenate([result["move_times"] for result in results])
+    low, high = wilson_interval(wins, games, confidence)
+    split = {key: total(key) for key in ("generation", "reveal", "solve")}
+    busy = sum(split.values())
+    return {
+        "name": name,
+        "shape": list(shape),
+        "num_mines": num_mines,
+        "games": games,
+        "seed": seed,
+        "workers": workers,
+        "wins": wins,
+        "win_rate": wins / games,
+        "win_rate_interval": [low, high],
+        "confidence": confidence,
+        "wall_time": wall_time,
+        "games_per_second": games / wall_time,
+        "clicks_per_second": clicks / wall_time,
+        "clicks_per_game": clicks / games,
+        "guesses_per_game": total("guesses") / games,
+        "move_time": {
+            "p50": float(np.percentile(move_times, 50)),
+            "p99": float(np.percentile(move_times, 99)),
+            "mean": float(move_times.mean()),
+        },
+        # Seconds summed over every worker, and their shares
+        "time_split": {key: {"seconds": value, "fraction": value / busy}
+                       for key, value in split.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--games", type=int, default=1000,
+                        help="games played for each board type")
+    parser.add_argument("--presets", nargs="*", default=list(LadSweeper.PRESETS),
+                        choices=list(LadSweeper.PRESETS))
+    parser.add_argument("--custom", nargs=3, type=int, action="append",
+                        default=[], metavar=("ROWS", "COLUMNS", "MINES"),
+                        help="extra board type, may be given more than once")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--output", help="write the JSON here, not stdout")
+    args = parser.parse_args()
+
+    boards: List[Tuple[str, Tuple[int, int], int]] = [
+        (name, *LadSweeper.PRESETS[name]) for name in args.presets]
+    boards += [(f"custom {rows}x{columns}/{mines}", (rows, columns), mines)
+               for rows, columns, mines in args.custom]
+
+    with ProcessPoolExecutor(args.workers) as pool:
+        results = [run(name, shape, num_mines, args.games, args.seed, pool,
+                       args.workers, args.confidence)
+                   for name, shape, num_mines in boards]
+
+    report = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
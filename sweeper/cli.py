@@ -0,0 +1,149 @@
+"""
+The `sweeper` command
+
+    sweeper generate DIR -n 1000000 --preset expert --workers 8
+    sweeper play --preset intermediate --renderer canvas
+    sweeper solve --games 200 --shape 30x30 --mines 150
+    sweeper bench solver --games 1000
+
+Each subcommand imports what it needs when it runs, so starting
+the command, or a worker that only generates grids, never loads
+tkinter or PIL.
+"""
+import argparse
+import pkgutil
+import runpy
+import sys
+from time import perf_counter
+from typing import List, Tuple
+
+from sweeper.benchmarks._common import parse_shape
+from sweeper.lad_sweeper import LadSweeper
+
+PRESETS = LadSweeper.PRESETS
+
+
+def add_board_arguments(parser: argparse.ArgumentParser) -> None:
+    """--preset, or --shape and --mines"""
+    parser.add_argument("--preset", choices=PRESETS, default="expert")
+    parser.add_argument("--shape", type=parse_shape,
+                        help="ROWSxCOLUMNS, instead of the preset's")
+    parser.add_argument("--mines", type=int,
+                        help="number of mines, instead of the preset's")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def board(args: argparse.Namespace) -> Tuple[Tuple[int, int], int]:
+    """The shape and mine count asked for"""
+    shape, num_mines = PRESETS[args.preset]
+    return (shape if args.shape is None else args.shape,
+            num_mines if args.mines is None else args.mines)
+
+
+def generate(args: argparse.Namespace) -> None:
+    """Write a dataset of grids, see `write_grid_dataset`"""
+    from sweeper.data.grid_dataset import write_grid_dataset
+    from sweeper.data.parallel import ParallelGridGenerator
+
+    shape, num_mines = board(args)
+    start = perf_counter()
+    with ParallelGridGenerator(shape, num_mines, seed=args.seed,
+                               workers=args.workers) as generator:
+        # A block for every worker in each chunk. Any multiple of the
+        # block size gives the same grids, so the output doesn't
+        # depend on the number of workers
+        chunk_size = args.chunk_size or generator.workers * generator.block_size
+        write_grid_dataset(args.path, generator, args.grids,
+                           chunk_size=chunk_size,
+                           shard_size=args.shard_size, fmt=args.format)
+    seconds = perf_counter() - start
+    print(f"{args.grids} {shape} grids with {num_mines} mines written to "
+          f"{args.path} in {seconds:.2f}s ({args.grids / seconds:.0f} grids/s)")
+
+
+def play(args: argparse.Namespace) -> None:
+    """Open the game window"""
+    import tkinter as tk
+    from sweeper.gui.gui import LadSweeperApp
+
+    shape, num_mines = board(args)
+    root = tk.Tk()
+    LadSweeperApp(root, shape, num_mines, renderer=args.renderer)
+    root.mainloop()
+
+
+def solve(args: argparse.Namespace) -> None:
+    """Play games with the solver and report how it did"""
+    import numpy as np
+    from sweeper.benchmarks.solver import play_games, wilson_interval
+
+    shape, num_mines = board(args)
+    start = perf_counter()
+    totals = play_games(shape, num_mines, args.games,
+                        np.random.SeedSequence(args.seed))
+    seconds = perf_counter() - start
+    low, high = wilson_interval(totals["wins"], args.games)
+    print(f"{totals['wins']}/{args.games} {shape} games with {num_mines} mines "
+          f"won ({totals['wins'] / args.games:.1%}, 95% interval "
+          f"{low:.1%}-{high:.1%}), {args.games / seconds:.1f} games/s")
+
+
+def benchmarks() -> List[str]:
+    """Names of the modules in sweeper.benchmarks"""
+    import sweeper.benchmarks
+    return sorted(module.name for module in
+                  pkgutil.iter_modules(sweeper.benchmarks.__path__)
+                  if not module.name.startswith("_"))
+
+
+def bench(args: argparse.Namespace) -> None:
+    """Run a benchmark module with the rest of the arguments"""
+    names = benchmarks()
+    if args.name not in names:
+        raise SystemExit(f"unknown benchmark {args.name!r}, "
+                         f"choose from {', '.join(names)}")
+    module = f"sweeper.benchmarks.{args.name}"
+    sys.argv = [module, *args.arguments]
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="sweeper", description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("generate", help=generate.__doc__)
+    command.add_argument("path", help="directory to write the dataset into")
+    command.add_argument("-n", "--grids", type=int, default=100_000)
+    add_board_arguments(command)
+    command.add_argument("--workers", type=int, default=None,
+                         help="worker processes, the CPU count by default")
+    command.add_argument("--chunk-size", type=int, default=None,
+                         help="grids made at once, a block for every worker "
+                              "by default")
+    command.add_argument("--shard-size", type=int, default=1_000_000)
+    command.add_argument("--format", choices=("npy", "raw"), default="npy")
+    command.set_defaults(run=generate)
+
+    command = commands.add_parser("play", help=play.__doc__)
+    add_board_arguments(command)
+    command.add_argument("--renderer", choices=("buttons", "canvas"),
+                         default="buttons")
+    command.set_defaults(run=play)
+
+    command = commands.add_parser("solve", help=solve.__doc__)
+    command.add_argument("--games", type=int, default=100)
+    add_board_arguments(command)
+    command.set_defaults(run=solve)
+
+    command = commands.add_parser("bench", help=bench.__doc__)
+    command.add_argument("name", help="module in sweeper.benchmarks")
+    command.add_argument("arguments", nargs=argparse.REMAINDER,
+                         help="passed on to the benchmark")
+    command.set_defaults(run=bench)
+
+    args = parser.parse_args(argv)
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
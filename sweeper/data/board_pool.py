@@ -0,0 +1,242 @@
+import threading
+from typing import Tuple
+
+import numpy as np
+
+from sweeper.data.grid_generator import GridGenerator
+
+
+def clear_around(board: np.ndarray, coord: Tuple[int, int], num_mines: int,
+                 rng: np.random.Generator) -> np.ndarray:
+    """
+    Move the mines on and around `coord` to random cells away from
+    it, so clicking `coord` opens a region
+
+    Only the counts next to the moved mines are updated, so the
+    cost depends on the number of mines moved, not the board size.
+    If the board is too full to clear the whole 3x3 neighbourhood,
+    only the clicked cell is cleared.
+
+    Parameters
+    ----------
+    board: np.ndarray
+        A complete grid, changed in place
+    coord: tuple[int, int]
+        The cell to be clicked first
+    num_mines: int
+        Mines on the board
+    rng: np.random.Generator
+        Picks where the mines go
+
+    Returns
+    -------
+    board: np.ndarray
+        The same board
+    """
+    columns = board.shape[1]
+    row, column = coord
+    zone = (slice(max(row - 1, 0), row + 2), slice(max(column - 1, 0), column + 2))
+    if board[zone].size + num_mines > board.size:
+        zone = (slice(row, row + 1), slice(column, column + 1))
+    zone_rows, zone_columns = zone
+
+    def near(i: int, j: int) -> Tuple[slice, slice]:
+        return slice(max(i - 1, 0), i + 2), slice(max(j - 1, 0), j + 2)
+
+    moved = np.argwhere(board[zone] < 0) + (zone_rows.start, zone_columns.start)
+    for i, j in moved.tolist():
+        # Pick a free cell outside the zone for the mine
+        while True:
+            new_i, new_j = divmod(int(rng.integers(board.size)), columns)
+            if board[new_i, new_j] >= 0 and not (
+                    zone_rows.start <= new_i < zone_rows.stop
+                    and zone_columns.start <= new_j < zone_columns.stop):
+                break
+        board[i, j] = 0
+        neighbours = board[near(i, j)]
+        neighbours[neighbours > 0] -= 1
+        neighbours = board[near(new_i, new_j)]
+        neighbours[neighbours >= 0] += 1
+        board[new_i, new_j] = -1
+
+    # The cells the mines left still need their own counts
+    for i, j in moved.tolist():
+        board[i, j] = np.count_nonzero(board[near(i, j)] < 0)
+    return board
+
+
+class BoardPool:
+    """
+    A store of ready made grids, topped up in large batches by a
+    background thread, so a new game never waits on generation
+
+    The grids sit in a ring buffer. `get` takes the next one in
+    O(1), and when fewer than `low` are left the thread wakes and
+    refills the pool in batches until it holds `high`, then sleeps
+    again. The gap between the two means it fills in a few large
+    batches rather than one grid at a time.
+    >>> with BoardPool(GridGenerator((16, 30), 99)) as pool:
+    ...     board = pool.get()
+    ...     safe_board = pool.get(first_click=(3, 4))
+
+    For first click safe games `get` is given the click and finds
+    one of the next `SEARCH` grids with a 0 there, or failing that
+    moves the mines off the clicked cell and, when the density
+    allows, its neighbours with `clear_around`.
+    """
+    SEARCH = 64 #  grids looked through for one with a 0 at the click
+
+    def __init__(self,
+                 generator: GridGenerator,
+                 capacity: int = 4096,
+                 low: int | None = None,
+                 high: int | None = None,
+                 batch_size: int = 1024):
+        """
+        Parameters
+        ----------
+        generator: GridGenerator
+            Makes the grids. Only the pool's thread uses it from
+            then on
+        capacity: int
+            Most grids held at once
+        low: int | None
+            Refilling starts when fewer grids than this are left,
+            capacity // 4 (at least 1) by default
+        high: int | None
+            Refilling stops once this many are held, capacity by
+            default
+        batch_size: int
+            Most grids made by one `generate_n_grids` call
+
+        Raises
+        ------
+        ValueError
+            Unless 0 < low <= high <= capacity
+        """
+        self.generator = generator
+        self.shape = tuple(generator.grid_shape)
+        self.capacity = capacity
+        self.low = max(1, capacity // 4) if low is None else low
+        self.high = capacity if high is None else high
+        if not 0 < self.low <= self.high <= self.capacity:
+            raise ValueError(f"need 0 < low <= high <= capacity, not low={self.low}, "
+                             f"high={self.high}, capacity={self.capacity}")
+        self.batch_size = batch_size
+        self.rng = np.random.default_rng(generator.seed_sequence.spawn(1)[0])
+
+        self.boards = np.empty((capacity, *self.shape), dtype=np.int8)
+        self.head = 0 #  index of the next grid out
+        self.count = 0
+        self.condition = threading.Condition()
+        self.closed = False
+        # What stopped the refill thread, raised by `get`
+        self.error: BaseException | None = None
+
+        # How often a `get` found the pool empty, and had to clear
+        # the first click itself
+        self.waits = 0
+        self.cleared = 0
+
+        self.thread = threading.Thread(target=self._fill, daemon=True)
+        self.thread.start()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """Stop the refill thread"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+
+    def _fill(self) -> None:
+        """
+        The refill thread: sleep until below `low`, fill to `high`.
+        If making grids fails the error is kept for `get` to raise
+        """
+        try:
+            self._refill()
+        except Exception as error:
+            with self.condition:
+                self.error = error
+                self.condition.notify_all()
+
+    def _refill(self) -> None:
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.closed
+                                        or self.count < self.low)
+                if self.closed:
+                    return
+            while True:
+                with self.condition:
+                    N = min(self.batch_size, self.high - self.count)
+                    if self.closed or N <= 0:
+                        break
+                grids = self.generator.generate_n_grids(N)
+                with self.condition:
+                    tail = (self.head + self.count
+                            + np.arange(N)) % self.capacity
+                    self.boards[tail] = grids
+                    self.count += N
+                    self.condition.notify_all()
+
+    def get(self, first_click: Tuple[int, int] | None = None) -> np.ndarray:
+        """
+        Take a grid out of the pool, waiting for one if it's empty
+
+        Parameters
+        ----------
+        first_click: tuple[int, int] | None
+            If given, this cell of the grid returned is safe, and a
+            0 when the density allows
+
+        Returns
+        -------
+        board: np.ndarray
+            An int8 grid, owned by the caller
+
+        Raises
+        ------
+        RuntimeError
+            If the pool is empty and closed, or its refill thread
+            has failed
+        """
+        with self.condition:
+            if not self.count:
+                self.waits += 1
+                self.condition.notify_all()
+                self.condition.wait_for(lambda: self.count > 0 or self.closed
+                                        or self.error is not None)
+            if not self.count:
+                if self.error is not None:
+                    raise RuntimeError("the board pool's refill thread "
+                                       "failed") from self.error
+                raise RuntimeError("the board pool is closed and empty")
+            index = self.head
+            if first_click is not None:
+                ahead = (self.head + np.arange(min(self.count, self.SEARCH))
+                         ) % self.capacity
+                empty = np.flatnonzero(self.boards[(ahead, *first_click)] == 0)
+                if len(empty):
+                    index = ahead[empty[0]]
+            board = self.boards[index].copy()
+            # The grid at the head fills the gap left behind
+            self.boards[index] = self.boards[self.head]
+            self.head = (self.head + 1) % self.capacity
+            self.count -= 1
+            if self.count < self.low:
+                self.condition.notify_all()
+
+        if first_click is not None and board[first_click] != 0:
+            self.cleared += 1
+            clear_around(board, first_click, self.generator.num_mines, self.rng)
+        return board
@@ -0,0 +1,156 @@
+from functools import lru_cache
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+from sweeper.data.grid_generator import GridGenerator
+from sweeper.data.openings import dilate, label_openings
+from sweeper.reveal import neighbour_table
+
+# One-hot of the revealed count 0-8, then a hidden flag
+NUM_FEATURES = 10
+HIDDEN_FEATURE = 9
+
+
+@lru_cache(maxsize=32)
+def edge_index(shape: Tuple[int, int]) -> np.ndarray:
+    """
+    The directed edges between every pair of neighbouring cells of
+    a board, in both directions, as (source, target) flat indices
+
+    Returns
+    -------
+    edges: np.ndarray
+        Read-only int64 array with shape (2, num_edges). Cached, so
+        the same array is returned for every board of a shape
+    """
+    table = neighbour_table(shape)
+    size = len(table)
+    sources = np.repeat(np.arange(size), table.shape[1])
+    targets = table.reshape(-1)
+    on_board = targets < size
+    edges = np.stack([sources[on_board], targets[on_board]]).astype(np.int64)
+    edges.flags.writeable = False
+    return edges
+
+
+def sample_visible(grids: np.ndarray,
+                   rng: np.random.Generator,
+                   opening_rate: float = 0.5,
+                   number_rate: float = 0.1,
+                   labels: np.ndarray | None = None) -> np.ndarray:
+    """
+    Sample partly played positions: each opening is revealed with
+    probability `opening_rate`, with the numbers around it as a
+    click would, and every other number with probability
+    `number_rate`. Mines are never revealed
+
+    Parameters
+    ----------
+    grids: np.ndarray
+        Grids with shape (N, rows, columns)
+    rng: np.random.Generator
+        Source of the samples
+    opening_rate, number_rate: float
+        Chance of revealing each opening, and each number
+    labels: np.ndarray | None
+        The output of `label_openings`, calculated if not given
+
+    Returns
+    -------
+    visible: np.ndarray
+        bool array the same shape as `grids`
+    """
+    if labels is None:
+        labels = label_openings(grids)
+    N = len(grids)
+    chosen = rng.random((N, int(labels.max(initial=0)) + 1)) < opening_rate
+    chosen[:, 0] = False #  0 is off the openings
+    visible = dilate(chosen[np.arange(N)[:, None, None], labels])
+    visible |= (grids > 0) & (rng.random(grids.shape) < number_rate)
+    return visible
+
+
+def node_features(grids: np.ndarray, visible: np.ndarray,
+                  dtype=np.float32) -> np.ndarray:
+    """
+    One-hot node features of every cell: the count of revealed
+    cells, `HIDDEN_FEATURE` for the rest
+
+    Returns
+    -------
+    features: np.ndarray
+        Array with shape (N, rows * columns, NUM_FEATURES)
+    """
+    N = len(grids)
+    channels = np.where(visible, grids, HIDDEN_FEATURE).reshape(-1)
+    features = np.zeros((channels.size, NUM_FEATURES), dtype=dtype)
+    features[np.arange(channels.size), channels] = 1
+    return features.reshape(N, -1, NUM_FEATURES)
+
+
+def graph_batch(grids: np.ndarray, visible: np.ndarray,
+                dtype=np.float32) -> Dict[str, np.ndarray]:
+    """
+    Join a batch of boards into one graph of disconnected boards,
+    the usual way of batching graphs for a GNN
+
+    Parameters
+    ----------
+    grids: np.ndarray
+        Grids with shape (N, rows, columns)
+    visible: np.ndarray
+        bool mask of the revealed cells, same shape
+    dtype:
+        Type of the node features
+
+    Returns
+    -------
+    graph: dict[str, np.ndarray]
+        Contiguous arrays:
+        x: node features, shape (N * rows * columns, NUM_FEATURES)
+        edge_index: int64 edges, shape (2, N * num_edges), each
+            board's nodes numbered after the boards before it
+        y: int8 labels, 1 for mines
+        hidden: bool mask of the nodes to predict
+        batch: int64 board index of every node
+    """
+    N, rows, columns = grids.shape
+    size = rows * columns
+    edges = edge_index((rows, columns))
+    offsets = np.arange(N, dtype=np.int64) * size
+    return {
+        "x": node_features(grids, visible, dtype).reshape(N * size, NUM_FEATURES),
+        "edge_index": (edges[:, None, :] + offsets[None, :, None]).reshape(2, -1),
+        "y": (grids < 0).reshape(-1).view(np.int8),
+        "hidden": ~visible.reshape(-1),
+        "batch": np.repeat(np.arange(N, dtype=np.int64), size),
+    }
+
+
+def graph_batches(generator: GridGenerator,
+                  N: int,
+                  batch_size: int,
+                  rng: np.random.Generator | None = None,
+                  opening_rate: float = 0.5,
+                  number_rate: float = 0.1,
+                  dtype=np.float32) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Stream N boards from `generator` as graph batches, each with
+    a sampled position (see `sample_visible` and `graph_batch`)
+
+    Only one batch is alive at once, so N can be far more than
+    fits in memory:
+    >>> for graph in graph_batches(GridGenerator((16, 30), 99), 10**7, 1024):
+    ...     train_step(graph)
+
+    Yields
+    ------
+    graph: dict[str, np.ndarray]
+        As returned by `graph_batch`, for up to `batch_size` boards
+    """
+    if rng is None:
+        rng = np.random.default_rng(generator.seed_sequence.spawn(1)[0])
+    for grids in generator.generate_chunks(N, batch_size):
+        visible = sample_visible(grids, rng, opening_rate, number_rate)
+        yield graph_batch(grids, visible, dtype)
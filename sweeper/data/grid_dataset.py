@@ -0,0 +1,187 @@
+import json
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+
+from sweeper.data.grid_generator import GridGenerator
+
+
+MANIFEST_NAME = "manifest.json"
+FORMATS = ("npy", "raw")
+
+
+def write_grid_dataset(path: Union[str, Path],
+                       generator: GridGenerator,
+                       N: int,
+                       chunk_size: int = 10_000,
+                       shard_size: int = 1_000_000,
+                       fmt: str = "npy") -> dict:
+    """
+    Stream N lad-sweeper grids from `generator` into a directory
+    of on-disk shards
+
+    Grids are made `chunk_size` at a time and written straight
+    into the shard files, so peak memory is set by `chunk_size`
+    and not by N. A `manifest.json` describing the dataset is
+    written last, once every shard is complete.
+
+    Parameters
+    ----------
+    path: str | Path
+        Directory to write the dataset into. Created if missing
+    generator: GridGenerator
+        Source of the grids. Its `manifest_fields`, the shape,
+        mine count and seed, are recorded in the manifest
+    N: int
+        Total number of grids to write
+    chunk_size: int
+        Number of grids generated at once
+    shard_size: int
+        Maximum number of grids in each shard file
+    fmt: str
+        "npy" for `.npy` files or "raw" for headerless `.bin`
+        files. Both can be opened with `np.memmap`
+
+    Returns
+    -------
+    manifest: dict
+        The contents of the manifest that was written
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {FORMATS}, not {fmt!r}")
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    chunk_size = min(chunk_size, shard_size)
+
+    shards = []
+    offset = 0
+    for shard_index, shard_start in enumerate(range(0, N, shard_size)):
+        count = min(shard_size, N - shard_start)
+        filename = f"shard_{shard_index:05d}.{'npy' if fmt == 'npy' else 'bin'}"
+        shape = (count, *generator.grid_shape)
+        if fmt == "npy":
+            shard = np.lib.format.open_memmap(path / filename, mode="w+",
+                                              dtype=np.int8, shape=shape)
+        else:
+            shard = np.memmap(path / filename, mode="w+",
+                              dtype=np.int8, shape=shape)
+
+        written = 0
+        for grids in generator.generate_chunks(count, chunk_size):
+            shard[written:written + len(grids)] = grids
+            written += len(grids)
+        shard.flush()
+        del shard
+
+        shards.append({"file": filename, "offset": offset, "count": count})
+        offset += count
+
+    manifest = {"format": fmt,
+                "dtype": np.dtype(np.int8).str,
+                **generator.manifest_fields(),
+                "num_grids": N,
+                "chunk_size": chunk_size,
+                "shards": shards}
+    with open(path / MANIFEST_NAME, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class GridDataset:
+    """
+    Read-only view onto a dataset written by `write_grid_dataset`
+
+    Every shard is opened with `np.memmap`, so nothing is read
+    from disk until it is indexed. Integer indexing returns a
+    single grid and slicing returns a stacked array, both
+    spanning shards where needed:
+    >>> data = GridDataset("grids/")
+    >>> grid = data[0]
+    >>> batch = data[1000:2000]
+    """
+    def __init__(self, path: Union[str, Path]):
+        """
+        Parameters
+        ----------
+        path: str | Path
+            Directory holding `manifest.json` and the shards
+        """
+        self.path = Path(path)
+        with open(self.path / MANIFEST_NAME) as f:
+            self.manifest = json.load(f)
+
+        self.grid_shape = tuple(self.manifest["grid_shape"])
+        self.num_mines = self.manifest["num_mines"]
+        self.seed = self.manifest["seed"]
+        # Manifests written before the spawn key was kept have none
+        self.seed_sequence = np.random.SeedSequence(
+            self.seed, spawn_key=self.manifest.get("spawn_key", ()))
+        self.dtype = np.dtype(self.manifest["dtype"])
+
+        self.shards = [self.open_shard(shard)
+                       for shard in self.manifest["shards"]]
+        self.offsets = np.array([shard["offset"]
+                                 for shard in self.manifest["shards"]])
+
+    def open_shard(self, shard: dict) -> np.memmap:
+        """
+        Memory map a single shard described in the manifest
+        """
+        filename = self.path / shard["file"]
+        shape = (shard["count"], *self.grid_shape)
+        if self.manifest["format"] == "npy":
+            data = np.load(filename, mmap_mode="r")
+            if data.shape != shape:
+                raise ValueError(f"{filename} has shape {data.shape}, "
+                                 f"manifest says {shape}")
+            return data
+        return np.memmap(filename, dtype=self.dtype, mode="r", shape=shape)
+
+    def __len__(self) -> int:
+        return self.manifest["num_grids"]
+
+    def __iter__(self):
+        for shard in self.shards:
+            yield from shard
+
+    def __getitem__(self, key: Union[int, slice]) -> np.ndarray:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(len(self))
+            if step != 1:
+                raise IndexError("GridDataset slices must have step 1")
+            return self.read(start, stop)
+        index = int(key)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"index {key} out of range for "
+                             f"{len(self)} grids")
+        shard = np.searchsorted(self.offsets, index, side="right") - 1
+        return self.shards[shard][index - self.offsets[shard]]
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """
+        Return grids [start, stop) as one array. Only the shards
+        overlapping the range are touched
+
+        Returns
+        -------
+        grids: np.ndarray
+            A view into a shard if the range lies inside one,
+            otherwise a copy with shape (stop - start, *grid_shape)
+        """
+        if stop <= start:
+            return np.empty((0, *self.grid_shape), dtype=self.dtype)
+        first = np.searchsorted(self.offsets, start, side="right") - 1
+        last = np.searchsorted(self.offsets, stop - 1, side="right") - 1
+        if first == last:
+            offset = self.offsets[first]
+            return self.shards[first][start - offset:stop - offset]
+        parts = []
+        for shard in range(first, last + 1):
+            offset = self.offsets[shard]
+            lo = max(start - offset, 0)
+            hi = min(stop - offset, len(self.shards[shard]))
+            parts.append(self.shards[shard][lo:hi])
+        return np.concatenate(parts)
@@ -1,5 +1,54 @@
+from typing import Iterator, Tuple
+
 import numpy as np
-from numpy.lib.stride_tricks import as_strided
+
+
+def count_neighbours(mined_grids: np.ndarray,
+                     out: np.ndarray | None = None) -> np.ndarray:
+    """
+    Fill in the neighbour counts of a stack of mined grids
+
+    Method
+    ------
+    The 3x3 neighbourhood sum is separable, so it is built from
+    shifted slices added in place:
+    1. Sum each cell with its left and right neighbours
+    2. Sum those row totals with the rows above and below
+    3. Put the mines back in place
+    Only one grid sized int8 temporary is used, so memory stays
+    at a couple of bytes per cell for any board size.
+
+    Parameters
+    ----------
+    mined_grids: np.ndarray
+        Grids with shape (N, rows, columns), -1 for mines and 0
+        elsewhere
+    out: np.ndarray | None
+        Optional int8 array with the same shape to write into
+
+    Returns
+    -------
+    grids: np.ndarray
+        The completed int8 grids, -1 for mines, counts elsewhere
+    """
+    mines = mined_grids < 0
+    ones = mines.view(np.int8) #  0/1 without a copy
+
+    # Row sums of each cell and its left/right neighbours
+    row_sums = ones.copy()
+    row_sums[:, :, 1:] += ones[:, :, :-1]
+    row_sums[:, :, :-1] += ones[:, :, 1:]
+
+    # Add on the row sums above and below
+    if out is None:
+        out = np.empty(mined_grids.shape, dtype=np.int8)
+    out[...] = row_sums
+    out[:, 1:] += row_sums[:, :-1]
+    out[:, :-1] += row_sums[:, 1:]
+
+    np.copyto(out, -1, where=mines)
+    return out
+
 
 class GridGenerator:
     """
@@ -11,24 +60,79 @@ class GridGenerator:
     >>> grid = next(gen)
 
     However, to make many grids at once call the `generate_n_grids`
-    method with the desired number.
+    method with the desired number. For datasets too big to hold in
+    memory, `generate_chunks` yields them a fixed number at a time.
+
+    `generate_n_no_guess` (and `generate_no_guess_chunks`) only
+    return grids that can be cleared from a click on their largest
+    opening without ever guessing, with that first click.
+
+    Passing a `seed` (an int or a `np.random.SeedSequence`) makes
+    the sequence of grids reproducible. The seed actually used
+    (entropy drawn from the OS if `seed` is None) is kept in
+    `self.seed`. With either sampler the grids for a seed are the
+    same however they're split into calls or batches, but the two
+    samplers give different grids.
+
+    Grids are made in batches of at most `max_batch_bytes` of
+    working memory, so even very large boards (1000x1000 and up)
+    don't need memory for all N grids' temporaries at once.
 
     Method
     ------
     1. Generate N sets of shuffled coordinates 1D coordinates.
-       Return the first `num_mines` from each set of coordinates
-    2. Insert the N coordinates into a 3D pre-made stack of grids
-       with a NumPy strided view into it of all the neighbours.
-    3. Take the absolute value of the sum of all the neighbours
+       Return the first `num_mines` from each set of coordinates.
+       For mine densities under `SPARSE_DENSITY` the mines are
+       sampled directly instead, see `sparse_coords`
+    2. Insert the N coordinates into a 3D stack of empty grids
+    3. Count the neighbouring mines of every cell with shifted
+       slices (see `count_neighbours`)
     4. Put the mines back in place
     """
-    def __init__(self, grid_shape=(16, 16), num_mines=44):
+    MAX_BATCH_BYTES = 64 * 2**20
+    # Below this mine density the sparse sampler beats shuffling
+    SPARSE_DENSITY = 0.25
+    SAMPLERS = ("auto", "permute", "sparse")
+    # Most grids tried at once when looking for no-guess grids
+    NO_GUESS_BATCH = 4096
+    # Grids tried for each one asked for before giving up
+    NO_GUESS_MAX_TRIES = 10_000
+
+    def __init__(self, grid_shape=(16, 16), num_mines=44, seed=None,
+                 max_batch_bytes: int = MAX_BATCH_BYTES,
+                 sampler: str = "auto"):
         self.grid_shape = grid_shape
         self.rows, self.columns = grid_shape
         self.size = self.rows * self.columns
         self.num_mines = num_mines
+        self.max_batch_bytes = max_batch_bytes
+
+        # Smallest integer type that can hold every 1D coordinate
+        self.index_dtype = np.min_scalar_type(max(self.size - 1, 0))
+
+        # How mine coordinates are picked, see `generate_n_coords`
+        if sampler not in self.SAMPLERS:
+            raise ValueError(f"sampler must be one of {self.SAMPLERS}, "
+                             f"not {sampler!r}")
+        if sampler == "auto":
+            density = num_mines / self.size
+            sampler = "sparse" if density < self.SPARSE_DENSITY else "permute"
+        self.sampler = sampler
 
-        self.rng = np.random.default_rng()
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+        self.seed = self.seed_sequence.entropy
+        self.rng = np.random.default_rng(self.seed_sequence)
+
+        # Grids tried by `generate_n_no_guess`, and those found to be
+        # no-guess
+        self.no_guess_attempts = 0
+        self.no_guess_accepted = 0
+        # BatchSolver for `generate_n_no_guess`, made on first use so
+        # the solver is only imported when it's needed
+        self._batch_solver = None
 
     def __iter__(self):
         return self
@@ -36,6 +140,24 @@ class GridGenerator:
     def __next__(self):
         return self.generate_n_grids(1)[0]
 
+    def manifest_fields(self) -> dict:
+        """
+        What a dataset manifest needs to make the same grids again,
+        as JSON friendly values. The seed is the SeedSequence's
+        entropy and spawn key, as a spawned child's entropy alone
+        gives its parent's grids
+
+        >>> fields = gen.manifest_fields()
+        >>> seed = np.random.SeedSequence(fields["seed"],
+        ...                               spawn_key=fields["spawn_key"])
+        """
+        return {"generator": type(self).__name__,
+                "grid_shape": list(self.grid_shape),
+                "num_mines": self.num_mines,
+                "seed": self.seed_sequence.entropy,
+                "spawn_key": list(self.seed_sequence.spawn_key),
+                "sampler": self.sampler}
+
     def generate_n_grids(self, N: int) -> np.ndarray:
         """
         Generate N lad-sweeper grids
@@ -48,32 +170,139 @@ class GridGenerator:
         Returns
         -------
         grids: np.ndarray
-            An array with shape (N, *self,shape)
+            An int8 array with shape (N, *self.grid_shape)
+        """
+        grids = np.empty((N, *self.grid_shape), dtype=np.int8)
+        for start in range(0, N, self.batch_size):
+            stop = min(start + self.batch_size, N)
+            # Make the grids with -1 for mines, 0 elsewhere
+            mined_grids = self.generate_n_mined_boards(stop - start)
+            count_neighbours(mined_grids, out=grids[start:stop])
+        return grids
+
+    @property
+    def batch_size(self) -> int:
+        """
+        The number of grids made at once to keep the working
+        memory under `max_batch_bytes`
+        """
+        # Shuffled coordinates, plus the mined grid, its mask and
+        # the row sums in `count_neighbours`
+        bytes_per_grid = self.size * (self.index_dtype.itemsize + 3)
+        return max(1, self.max_batch_bytes // bytes_per_grid)
+
+    def generate_chunks(self, N: int, chunk_size: int) -> Iterator[np.ndarray]:
         """
-        # Make a 3D grid padded in the last 2 dimensions to store
-        # the mine values
-        padded_shape = (N, self.rows + 2, self.columns+2)
-        padded = np.zeros(padded_shape, dtype=np.int8)
+        Generate N lad-sweeper grids, `chunk_size` at a time
 
-        # Make N grids with -1 for mines, 0 elsewhere
-        mined_grids = self.generate_n_mined_boards(N)
-        # Insert them into padded
-        padded[:,1:-1,1:-1] = mined_grids
+        Only one chunk is alive at once, so memory use is bounded
+        by `chunk_size` rather than N.
 
-        # Create a strided view of the neighbours of each layer
-        strides = (padded.strides[0],) + padded.strides[1:]*2
-        new_shape = (N, self.rows, self.columns, 3, 3)
-        neighbours = as_strided(padded, new_shape, strides)
+        Parameters
+        ----------
+        N: int
+            The total number of grids to make
+        chunk_size: int
+            The maximum number of grids in each chunk
+
+        Yields
+        ------
+        grids: np.ndarray
+            Arrays with shape (n, *self.grid_shape), n <= chunk_size
+        """
+        for start in range(0, N, chunk_size):
+            yield self.generate_n_grids(min(chunk_size, N - start))
+
+    def generate_n_no_guess(self, N: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate N lad-sweeper grids that can be solved without
+        guessing
 
-        # Sum all of the neighbours over the last 2 axes
-        counts = np.abs(np.sum(neighbours, axis=(-1, -2)))
+        Method
+        ------
+        1. Make a batch of grids with `generate_n_grids`: N at
+           first, then enough for the rest at the acceptance rate
+           so far
+        2. Play them all at once with `solve_without_guessing`,
+           starting from a click on each grid's largest opening
+        3. Keep the grids that were cleared and repeat until
+           there are N
 
-        # Return summed value or mine
-        return np.where(mined_grids == -1, -1, counts)
+        A no-guess grid needs a 0 to click first, which needs a
+        cell with no mines around it. When the board is too full
+        for that, or `NO_GUESS_MAX_TRIES` grids per grid asked for
+        are tried without finding N, ValueError is raised.
+
+        Parameters
+        ----------
+        N: int
+            The number of grids to make
+
+        Returns
+        -------
+        grids: np.ndarray
+            An int8 array with shape (N, *self.grid_shape)
+        clicks: np.ndarray
+            The flat index of the cell each grid is solved from
+
+        Raises
+        ------
+        ValueError
+            If no-guess grids can't be had, see above
+        """
+        from sweeper.solver.batch import BatchSolver
+        from sweeper.solver.no_guess import solve_without_guessing
+
+        # The smallest neighbourhood is a corner's
+        smallest = min(self.rows, 2) * min(self.columns, 2)
+        if N and self.size - self.num_mines < smallest:
+            raise ValueError(f"{self.num_mines} mines on a {self.grid_shape} "
+                             f"board leave no cell that can be a 0, so no grid "
+                             f"can be solved without guessing")
+        if self._batch_solver is None:
+            self._batch_solver = BatchSolver(self.grid_shape)
+        grids = np.empty((N, *self.grid_shape), dtype=np.int8)
+        clicks = np.empty(N, dtype=np.intp)
+        filled = 0
+        tries = 0
+        while filled < N:
+            if tries >= self.NO_GUESS_MAX_TRIES * N:
+                raise ValueError(f"only {filled} of {N} no-guess grids found in "
+                                 f"{tries} {self.grid_shape} grids with "
+                                 f"{self.num_mines} mines")
+            rate = max(self.acceptance_rate, 1e-3) if self.no_guess_attempts else 1
+            size = min(int((N - filled) / rate * 1.2) + 1,
+                       self.NO_GUESS_BATCH, self.batch_size)
+            batch = self.generate_n_grids(size)
+            solvable, first_clicks = solve_without_guessing(batch,
+                                                            self._batch_solver)
+            kept = np.flatnonzero(solvable)[:N - filled]
+            grids[filled:filled + len(kept)] = batch[kept]
+            clicks[filled:filled + len(kept)] = first_clicks[kept]
+            filled += len(kept)
+            self.no_guess_attempts += size
+            tries += size
+            self.no_guess_accepted += int(np.count_nonzero(solvable))
+        return grids, clicks
+
+    def generate_no_guess_chunks(self, N: int, chunk_size: int
+                                 ) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Generate N no-guess grids `chunk_size` at a time, yielding
+        (grids, clicks) as from `generate_n_no_guess`
+        """
+        for start in range(0, N, chunk_size):
+            yield self.generate_n_no_guess(min(chunk_size, N - start))
+
+    @property
+    def acceptance_rate(self) -> float:
+        """The fraction of grids tried that were no-guess"""
+        return self.no_guess_accepted / max(self.no_guess_attempts, 1)
 
     def generate_n_coords(self, N: int) -> np.ndarray:
         """
-        Return N rows of 1D coordinates containing mines
+        Return N rows of 1D coordinates containing mines, using
+        `sparse_coords` or `permuted_coords` as set by `self.sampler`
 
         Parameters
         ----------
@@ -86,8 +315,79 @@ class GridGenerator:
             2D array of 1D mine coordinates with shape
             (N, self.num_mines)
         """
-        coords = np.arange(self.size, dtype=np.int8) * np.ones(N, dtype=np.int8)[:,None]
-        return self.rng.permuted(coords, axis=1)[:, :self.num_mines]
+        if self.sampler == "sparse":
+            return self.sparse_coords(N)
+        return self.permuted_coords(N)
+
+    def permuted_coords(self, N: int) -> np.ndarray:
+        """
+        Shuffle every coordinate of N boards and keep the first
+        `num_mines` of each
+        """
+        coords = np.empty((N, self.size), dtype=self.index_dtype)
+        coords[:] = np.arange(self.size, dtype=self.index_dtype)
+        return self.rng.permuted(coords, axis=1, out=coords)[:, :self.num_mines]
+
+    def sparse_coords(self, N: int) -> np.ndarray:
+        """
+        Pick `num_mines` distinct coordinates for N boards without
+        shuffling the whole board
+
+        Method
+        ------
+        1. Draw a fixed number, `sparse_draws`, of coordinates per
+           board with replacement, enough to almost always hold
+           `num_mines` distinct ones
+        2. Keep the first `num_mines` distinct coordinates of each
+           row in the order they were drawn, found by sorting
+           (coordinate, position) keys
+        3. The rare row without enough distinct coordinates picks
+           its mines with a generator seeded from its own draws
+
+        Every board only uses its own row of draws, so the grids
+        made from a seed don't depend on how they're batched. And
+        nothing in the method favours any cell, so every set of
+        `num_mines` cells is equally likely, exactly as with
+        `permuted_coords`. The coordinates come back sorted.
+        """
+        if self.num_mines == 0:
+            return np.empty((N, 0), dtype=self.index_dtype)
+        draws = self.sparse_draws
+        values = self.rng.integers(0, self.size, (N, draws), dtype=np.uint32)
+
+        # Sorted by coordinate, then by when it was drawn
+        keys = values.astype(np.uint64) * np.uint64(draws)
+        keys += np.arange(draws, dtype=np.uint64)
+        keys.sort(axis=1)
+        coords = keys // np.uint64(draws)
+        positions = keys - coords * np.uint64(draws)
+        repeats = np.zeros(keys.shape, dtype=bool)
+        np.equal(coords[:, 1:], coords[:, :-1], out=repeats[:, 1:])
+        positions[repeats] = draws #  after every first draw
+
+        positions.sort(axis=1)
+        first = positions[:, :self.num_mines]
+        short = np.flatnonzero(first[:, -1] >= draws)
+        np.minimum(first, draws - 1, out=first) #  short rows are redone below
+        mine_coords = np.take_along_axis(values, first.astype(np.intp), axis=1)
+        for row in short:
+            rng = np.random.default_rng(values[row])
+            mine_coords[row] = rng.choice(self.size, self.num_mines, replace=False)
+        mine_coords.sort(axis=1)
+        return mine_coords.astype(self.index_dtype)
+
+    @property
+    def sparse_draws(self) -> int:
+        """
+        Coordinates drawn per board by `sparse_coords`: the expected
+        number of draws to see `num_mines` distinct cells plus 6
+        standard deviations, so almost every board has enough
+        """
+        taken = np.arange(self.num_mines)
+        free = self.size - taken
+        mean = np.sum(self.size / free)
+        variance = np.sum(self.size * taken / free**2)
+        return int(np.ceil(mean + 6 * np.sqrt(variance))) + 1
 
     def generate_n_mined_boards(self, N: int) -> np.array:
         """
@@ -104,8 +404,25 @@ class GridGenerator:
         mined_grids: np.ndarray
             Grids with mines in place but no counts
         """
+        return self.place_mines(self.generate_n_coords(N))
+
+    def place_mines(self, mine_coords: np.ndarray) -> np.ndarray:
+        """
+        Return 2D lad-sweeper boards with mines at the given
+        1D coordinates but no counts
+
+        Parameters
+        ----------
+        mine_coords: np.ndarray
+            2D array of 1D mine coordinates, one row per board
+
+        Returns
+        -------
+        mined_grids: np.ndarray
+            Grids with mines in place but no counts
+        """
+        N = len(mine_coords)
         boards = np.zeros((N, self.size), dtype=np.int8)
-        rows = np.repeat(np.arange(N), self.num_mines)
-        mines = self.generate_n_coords(N)
-        boards[(rows.flatten(), mines.flatten())] = -1
-        return boards.reshape(N, *self.grid_shape)
\ No newline at end of file
+        rows = np.repeat(np.arange(N), mine_coords.shape[1])
+        boards[(rows, mine_coords.flatten())] = -1
+        return boards.reshape(N, *self.grid_shape)
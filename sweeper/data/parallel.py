@@ -0,0 +1,210 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+import os
+from typing import Tuple
+
+import numpy as np
+
+from sweeper.data.grid_generator import GridGenerator
+
+
+def _fill_block(shm_name: str,
+                shape: Tuple[int, int, int],
+                start: int,
+                stop: int,
+                num_mines: int,
+                seed: np.random.SeedSequence) -> None:
+    """
+    Worker task: generate grids [start, stop) with their own
+    child seed and write them into the shared output array
+    """
+    shm = SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.int8, buffer=shm.buf)
+        generator = GridGenerator(shape[1:], num_mines, seed=seed)
+        out[start:stop] = generator.generate_n_grids(stop - start)
+        del out #  release the buffer so the segment can close
+    finally:
+        shm.close()
+
+
+def _fill_no_guess_block(shm_name: str,
+                         shape: Tuple[int, int, int],
+                         start: int,
+                         stop: int,
+                         num_mines: int,
+                         seed: np.random.SeedSequence
+                         ) -> Tuple[np.ndarray, int, int]:
+    """
+    Worker task: as `_fill_block` for no-guess grids. Returns the
+    first clicks, and the grids tried and accepted
+    """
+    shm = SharedMemory(name=shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.int8, buffer=shm.buf)
+        generator = GridGenerator(shape[1:], num_mines, seed=seed)
+        out[start:stop], clicks = generator.generate_n_no_guess(stop - start)
+        del out
+    finally:
+        shm.close()
+    return clicks, generator.no_guess_attempts, generator.no_guess_accepted
+
+
+class ParallelGridGenerator(GridGenerator):
+    """
+    A GridGenerator that spreads `generate_n_grids` over a pool
+    of worker processes
+
+    Method
+    ------
+    1. Split the N grids into fixed size blocks of `block_size`
+    2. Spawn one child SeedSequence per block from this
+       generator's SeedSequence
+    3. Each worker makes its block with its own child seed and
+       writes it straight into a shared memory output array,
+       so no grids are pickled back to the parent
+
+    As the blocks and their seeds don't depend on the number of
+    workers, the grids made from a given seed are identical
+    whatever `workers` is set to, including 1 (no pool at all).
+
+    `generate_n_no_guess` is spread the same way, in blocks of
+    `no_guess_block_size` accepted grids, which makes up for most
+    grids being thrown away on hard settings.
+
+    The pool is started lazily and kept until `close` is called,
+    or the generator is used as a context manager:
+    >>> with ParallelGridGenerator((16, 30), 99, seed=1) as gen:
+    ...     grids = gen.generate_n_grids(1_000_000)
+    """
+    def __init__(self, grid_shape=(16, 16), num_mines=44, seed=None,
+                 workers: int | None = None, block_size: int = 8192,
+                 no_guess_block_size: int = 256):
+        """
+        Parameters
+        ----------
+        grid_shape, num_mines, seed:
+            As for GridGenerator
+        workers: int | None
+            Number of worker processes, defaults to the CPU count
+        block_size: int
+            Grids made by each task. Part of what defines the
+            output for a seed, so keep it fixed for reproducibility
+        no_guess_block_size: int
+            No-guess grids made by each task, likewise
+        """
+        super().__init__(grid_shape, num_mines, seed)
+        self.workers = workers or os.cpu_count() or 1
+        self.block_size = block_size
+        self.no_guess_block_size = no_guess_block_size
+        self._pool: ProcessPoolExecutor | None = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def manifest_fields(self) -> dict:
+        """
+        As for GridGenerator, plus the block sizes, which also
+        decide which grids a seed makes
+        """
+        return {**super().manifest_fields(),
+                "block_size": self.block_size,
+                "no_guess_block_size": self.no_guess_block_size}
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def close(self) -> None:
+        """Shut down the worker pool, if one was started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def generate_n_grids(self, N: int) -> np.ndarray:
+        """
+        Generate N lad-sweeper grids across the worker pool
+
+        Parameters
+        ----------
+        N: int
+            The number of grids to make
+
+        Returns
+        -------
+        grids: np.ndarray
+            An int8 array with shape (N, *self.grid_shape)
+        """
+        shape = (N, *self.grid_shape)
+        starts = range(0, N, self.block_size)
+        seeds = self.seed_sequence.spawn(len(starts))
+
+        if self.workers == 1 or len(starts) == 1:
+            grids = np.empty(shape, dtype=np.int8)
+            for start, seed in zip(starts, seeds):
+                stop = min(start + self.block_size, N)
+                generator = GridGenerator(self.grid_shape,
+                                          self.num_mines, seed=seed)
+                grids[start:stop] = generator.generate_n_grids(stop - start)
+            return grids
+
+        shm = SharedMemory(create=True, size=max(1, N * self.size))
+        try:
+            tasks = [self.pool.submit(_fill_block, shm.name, shape, start,
+                                      min(start + self.block_size, N),
+                                      self.num_mines, seed)
+                     for start, seed in zip(starts, seeds)]
+            for task in tasks:
+                task.result() #  re-raise any worker errors
+            grids = np.ndarray(shape, dtype=np.int8, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+        return grids
+
+    def generate_n_no_guess(self, N: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate N no-guess grids across the worker pool, see
+        `GridGenerator.generate_n_no_guess`
+        """
+        if N == 0:
+            return (np.empty((0, *self.grid_shape), dtype=np.int8),
+                    np.empty(0, dtype=np.intp))
+        shape = (N, *self.grid_shape)
+        starts = range(0, N, self.no_guess_block_size)
+        seeds = self.seed_sequence.spawn(len(starts))
+        stops = [min(start + self.no_guess_block_size, N) for start in starts]
+
+        if self.workers == 1 or len(starts) == 1:
+            grids = np.empty(shape, dtype=np.int8)
+            clicks = np.empty(N, dtype=np.intp)
+            for start, stop, seed in zip(starts, stops, seeds):
+                generator = GridGenerator(self.grid_shape,
+                                          self.num_mines, seed=seed)
+                grids[start:stop], clicks[start:stop] = \
+                    generator.generate_n_no_guess(stop - start)
+                self.no_guess_attempts += generator.no_guess_attempts
+                self.no_guess_accepted += generator.no_guess_accepted
+            return grids, clicks
+
+        shm = SharedMemory(create=True, size=max(1, N * self.size))
+        try:
+            tasks = [self.pool.submit(_fill_no_guess_block, shm.name, shape,
+                                      start, stop, self.num_mines, seed)
+                     for start, stop, seed in zip(starts, stops, seeds)]
+            block_clicks = []
+            for task in tasks:
+                clicks, attempts, accepted = task.result()
+                block_clicks.append(clicks)
+                self.no_guess_attempts += attempts
+                self.no_guess_accepted += accepted
+            grids = np.ndarray(shape, dtype=np.int8, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+        return grids, np.concatenate(block_clicks)
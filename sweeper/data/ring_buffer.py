@@ -0,0 +1,222 @@
+import multiprocessing as mp
+from multiprocessing.shared_memory import SharedMemory
+import queue
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from sweeper.data.grid_generator import GridGenerator, count_neighbours
+
+
+class BoardRing:
+    """
+    A ring of batch sized slots of grids in shared memory, passed
+    between processes by slot index
+
+    Every slot index is always in exactly one place: the `free`
+    queue, the `full` queue, or held by the one process writing or
+    reading it. So a consumer can read a slot as a numpy view of
+    the shared memory with no copy and no lock.
+    >>> with ring.batch() as grids: #  in a consumer
+    ...     train_step(grids)        #  the slot is freed after
+
+    Producers wait for a free slot, which holds them back when the
+    consumers are slower (`policy="block"`), or take the oldest
+    unread batch and write over it, counting it in `dropped`, so
+    consumers always get recent grids (`policy="drop_oldest"`).
+
+    The ring can be passed to processes as they are started.
+    """
+    POLICIES = ("block", "drop_oldest")
+
+    def __init__(self,
+                 shape: Tuple[int, int],
+                 batch_size: int = 1024,
+                 slots: int = 16,
+                 policy: str = "block"):
+        """
+        Parameters
+        ----------
+        shape: tuple[int, int]
+            Grid shape
+        batch_size: int
+            Grids in each slot
+        slots: int
+            Number of slots
+        policy: str
+            What producers do when every slot is full, one of
+            `POLICIES`
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"policy must be one of {self.POLICIES}, "
+                             f"not {policy!r}")
+        self.shape = tuple(shape)
+        self.batch_size = batch_size
+        self.slots = slots
+        self.policy = policy
+        self.slot_shape = (batch_size, *self.shape)
+        self.slot_bytes = batch_size * self.shape[0] * self.shape[1]
+
+        self.shm = SharedMemory(create=True, size=max(1, slots * self.slot_bytes))
+        self.free: mp.Queue = mp.Queue()
+        self.full: mp.Queue = mp.Queue()
+        for slot in range(slots):
+            self.free.put(slot)
+        # Batches written, read, and written over unread
+        self.produced = mp.Value("q", 0)
+        self.consumed = mp.Value("q", 0)
+        self.dropped = mp.Value("q", 0)
+
+    def view(self, slot: int) -> np.ndarray:
+        """The grids of one slot, a view of the shared memory"""
+        return np.ndarray(self.slot_shape, dtype=np.int8, buffer=self.shm.buf,
+                          offset=slot * self.slot_bytes)
+
+    def acquire_free(self, timeout: float | None = None) -> int:
+        """
+        Take a slot to write to. Under "drop_oldest" the oldest
+        full slot is taken if none are free
+
+        Raises
+        ------
+        queue.Empty
+            If no slot could be had within `timeout` seconds
+        """
+        try:
+            return self.free.get(timeout=0 if self.policy == "drop_oldest"
+                                 else timeout)
+        except queue.Empty:
+            if self.policy == "block":
+                raise
+        slot = self.full.get(timeout=timeout)
+        with self.dropped.get_lock():
+            self.dropped.value += 1
+        return slot
+
+    def publish(self, slot: int) -> None:
+        """Hand a written slot to the consumers"""
+        with self.produced.get_lock():
+            self.produced.value += 1
+        self.full.put(slot)
+
+    def acquire_full(self, timeout: float | None = None) -> int:
+        """
+        Take the oldest written slot to read
+
+        Raises
+        ------
+        queue.Empty
+            If nothing was written within `timeout` seconds
+        """
+        return self.full.get(timeout=timeout)
+
+    def release(self, slot: int) -> None:
+        """Give a slot that has been read back to the producers"""
+        with self.consumed.get_lock():
+            self.consumed.value += 1
+        self.free.put(slot)
+
+    @contextmanager
+    def batch(self, timeout: float | None = None) -> Iterator[np.ndarray]:
+        """
+        Read the next batch as a zero copy view, which is only
+        valid inside the `with` block
+        """
+        slot = self.acquire_full(timeout)
+        try:
+            yield self.view(slot)
+        finally:
+            self.release(slot)
+
+    def close(self) -> None:
+        """Detach from the shared memory, in every process"""
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """Free the shared memory, once, by its creator"""
+        self.shm.unlink()
+
+
+def _produce(ring: BoardRing, num_mines: int, seed: np.random.SeedSequence,
+             stop: mp.Event) -> None:
+    """
+    Producer process: fill slots with fresh grids until `stop` is
+    set. Grids are counted straight into the slot
+    """
+    generator = GridGenerator(ring.shape, num_mines, seed=seed)
+    try:
+        while not stop.is_set():
+            try:
+                slot = ring.acquire_free(timeout=0.1)
+            except queue.Empty:
+                continue
+            out = ring.view(slot)
+            for start in range(0, ring.batch_size, generator.batch_size):
+                stop_index = min(start + generator.batch_size, ring.batch_size)
+                count_neighbours(generator.generate_n_mined_boards(stop_index - start),
+                                 out=out[start:stop_index])
+            del out
+            ring.publish(slot)
+    finally:
+        ring.close()
+
+
+class BoardService:
+    """
+    One or more generator processes filling a BoardRing, so many
+    training processes on a node can share them instead of each
+    running its own GridGenerator
+
+    >>> with BoardService((16, 30), 99, producers=2, seed=0) as service:
+    ...     worker = mp.Process(target=train, args=(service.ring,))
+    ...     worker.start()
+    ...     ...
+
+    and in `train`:
+    >>> with ring.batch() as grids:
+    ...     ...
+
+    Each producer has its own child seed of `seed`.
+    """
+    def __init__(self,
+                 shape: Tuple[int, int] = (16, 30),
+                 num_mines: int = 99,
+                 producers: int = 1,
+                 seed=None,
+                 batch_size: int = 1024,
+                 slots: int = 16,
+                 policy: str = "block"):
+        """
+        Parameters
+        ----------
+        shape, num_mines, seed:
+            As for GridGenerator
+        producers: int
+            Number of generator processes
+        batch_size, slots, policy:
+            As for BoardRing
+        """
+        self.ring = BoardRing(shape, batch_size, slots, policy)
+        seed_sequence = (seed if isinstance(seed, np.random.SeedSequence)
+                         else np.random.SeedSequence(seed))
+        self.stop = mp.Event()
+        self.producers = [mp.Process(target=_produce, daemon=True,
+                                     args=(self.ring, num_mines, child, self.stop))
+                          for child in seed_sequence.spawn(producers)]
+        for producer in self.producers:
+            producer.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """Stop the producers and free the shared memory"""
+        self.stop.set()
+        for producer in self.producers:
+            producer.join()
+        self.ring.close()
+        self.ring.unlink()
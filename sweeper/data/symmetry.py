@@ -0,0 +1,256 @@
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+_MAX_WORD = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """The splitmix64 finaliser, on uint64 arrays"""
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+class Symmetry:
+    """
+    The symmetries of a board shape: the 8 rotations and
+    reflections of a square, or the 4 that keep a non-square
+    board's shape
+
+    Each symmetry is kept as a permutation of flat cell indices,
+    so every symmetry of a whole batch is one gather:
+    >>> symmetry = Symmetry((16, 16))
+    >>> packed, transforms = symmetry.canonicalize(grids)
+    >>> hashes = symmetry.hash(packed)
+
+    Boards that are the same up to symmetry have the same
+    canonical form, the smallest packed mine bitmask (see
+    `GridCodec.encode_mines`) of all their symmetries, compared
+    byte by byte, and so the same hash.
+    """
+    SQUARE = ("identity", "rot90", "rot180", "rot270",
+              "transpose", "flip_rows", "anti_transpose", "flip_columns")
+    RECTANGLE = ("identity", "rot180", "flip_rows", "flip_columns")
+
+    def __init__(self, grid_shape: Tuple[int, int]):
+        """
+        Parameters
+        ----------
+        grid_shape: tuple[int, int]
+            Shape of every grid passed in
+        """
+        self.grid_shape = tuple(grid_shape)
+        rows, columns = self.grid_shape
+        self.size = rows * columns
+        self.names = self.SQUARE if rows == columns else self.RECTANGLE
+        cells = np.arange(self.size).reshape(self.grid_shape)
+        self.permutations = np.stack([self.transform(cells[None], name)[0].reshape(-1)
+                                      for name in self.names])
+        self.mine_bytes = -(-self.size // 8)
+        # Hash seeded with the shape, so equal bitmasks of different
+        # shapes don't collide
+        self.hash_seed = _mix(np.array([rows << 32 | columns], dtype=np.uint64))[0]
+
+    @staticmethod
+    def transform(grids: np.ndarray, name: str) -> np.ndarray:
+        """
+        One symmetry of a stack of grids, as a view with no copy
+        """
+        if name == "identity":
+            return grids
+        if name == "rot90":
+            return np.rot90(grids, 1, axes=(1, 2))
+        if name == "rot180":
+            return grids[:, ::-1, ::-1]
+        if name == "rot270":
+            return np.rot90(grids, 3, axes=(1, 2))
+        if name == "transpose":
+            return grids.transpose(0, 2, 1)
+        if name == "anti_transpose":
+            return grids[:, ::-1, ::-1].transpose(0, 2, 1)
+        if name == "flip_rows":
+            return grids[:, ::-1]
+        if name == "flip_columns":
+            return grids[:, :, ::-1]
+        raise ValueError(f"unknown symmetry {name!r}")
+
+    def views(self, grids: np.ndarray) -> List[np.ndarray]:
+        """
+        Every symmetry of a batch as views, for augmenting a batch
+        without copying it
+        """
+        return [self.transform(grids, name) for name in self.names]
+
+    def apply(self, grids: np.ndarray, transforms: np.ndarray) -> np.ndarray:
+        """
+        Give each grid its own symmetry
+
+        Parameters
+        ----------
+        grids: np.ndarray
+            Grids with shape (N, *self.grid_shape)
+        transforms: np.ndarray
+            Index into `self.names` for each grid
+
+        Returns
+        -------
+        grids: np.ndarray
+            A new array the same shape as `grids`
+        """
+        flat = grids.reshape(len(grids), self.size)
+        out = np.take_along_axis(flat, self.permutations[transforms], axis=1)
+        return out.reshape(grids.shape)
+
+    def augment(self, grids: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Give every grid a random symmetry"""
+        return self.apply(grids, rng.integers(len(self.names), size=len(grids)))
+
+    def canonicalize(self, grids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the canonical form of each grid's mine layout
+
+        Method
+        ------
+        1. Pack the mines of every symmetry of every grid, one
+           gather and one `np.packbits` for the whole batch
+        2. Read the bitmasks as big endian 64 bit words, so
+           comparing words compares bytes in order
+        3. Word by word, keep only the symmetries that tie for the
+           smallest word, until one (or identical ones) is left
+
+        Returns
+        -------
+        packed: np.ndarray
+            uint8 canonical bitmasks with shape (N, self.mine_bytes)
+        transforms: np.ndarray
+            Index into `self.names` of the symmetry that gives each
+            canonical form, for `apply`
+        """
+        N = len(grids)
+        mines = grids.reshape(N, self.size) < 0
+        packed = np.packbits(mines[:, self.permutations], axis=2)
+        words = self._words(packed)
+
+        candidates = np.ones(words.shape[:2], dtype=bool)
+        for word in range(words.shape[2]):
+            values = np.where(candidates, words[:, :, word], _MAX_WORD)
+            candidates &= values == values.min(axis=1, keepdims=True)
+        transforms = candidates.argmax(axis=1)
+        return packed[np.arange(N), transforms], transforms
+
+    def _words(self, packed: np.ndarray) -> np.ndarray:
+        """Bitmasks as uint64 words, zero padded, first byte most significant"""
+        num_words = -(-packed.shape[-1] // 8)
+        padded = np.zeros((*packed.shape[:-1], num_words * 8), dtype=np.uint8)
+        padded[..., :packed.shape[-1]] = packed
+        return padded.view(">u8").astype(np.uint64)
+
+    def hash(self, packed: np.ndarray) -> np.ndarray:
+        """
+        A 64 bit hash of each packed bitmask, the same on every
+        machine and numpy version
+
+        Parameters
+        ----------
+        packed: np.ndarray
+            uint8 bitmasks with shape (N, self.mine_bytes)
+
+        Returns
+        -------
+        hashes: np.ndarray
+            uint64 array with shape (N,)
+        """
+        words = self._words(packed)
+        hashes = np.full(len(packed), self.hash_seed, dtype=np.uint64)
+        for word in range(words.shape[1]):
+            hashes = _mix(hashes ^ words[:, word])
+        return hashes
+
+    def canonical_hashes(self, grids: np.ndarray) -> np.ndarray:
+        """The hash of each grid's canonical form"""
+        return self.hash(self.canonicalize(grids)[0])
+
+
+class Deduplicator:
+    """
+    Remembers the hashes it has seen, in bounded memory, to drop
+    repeated boards from a stream of batches
+
+    Hashes are kept in two sorted arrays, generations. New hashes
+    go into the current one; once it holds half of `capacity` it
+    becomes the previous generation and the old previous one is
+    forgotten. So at most `capacity` hashes (8 bytes each) are
+    held, and every hash is remembered for at least the next
+    capacity / 2 new ones.
+    >>> symmetry, seen = Symmetry((16, 16)), Deduplicator(10**7)
+    >>> for grids in generator.generate_chunks(10**9, 10**5):
+    ...     fresh = seen.add(symmetry.canonical_hashes(grids))
+    ...     write(grids[fresh])
+    """
+    def __init__(self, capacity: int = 10_000_000):
+        """
+        Parameters
+        ----------
+        capacity: int
+            Most hashes held at once
+        """
+        self.capacity = capacity
+        self.current = np.empty(0, dtype=np.uint64)
+        self.previous = np.empty(0, dtype=np.uint64)
+
+    def __len__(self) -> int:
+        return len(self.current) + len(self.previous)
+
+    @staticmethod
+    def _contains(sorted_hashes: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        if not len(sorted_hashes):
+            return np.zeros(len(hashes), dtype=bool)
+        positions = np.searchsorted(sorted_hashes, hashes)
+        positions[positions == len(sorted_hashes)] = 0
+        return sorted_hashes[positions] == hashes
+
+    def add(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Take in a batch of hashes
+
+        Returns
+        -------
+        fresh: np.ndarray
+            bool mask, True for the first of each hash in the batch
+            that hadn't been seen before
+        """
+        order = np.argsort(hashes, kind="stable")
+        ordered = hashes[order]
+        first = np.ones(len(ordered), dtype=bool)
+        np.not_equal(ordered[1:], ordered[:-1], out=first[1:])
+        ordered, order = ordered[first], order[first]
+
+        new = ~(self._contains(self.current, ordered)
+                | self._contains(self.previous, ordered))
+        fresh = np.zeros(len(hashes), dtype=bool)
+        fresh[order[new]] = True
+
+        # Added a generation's worth at a time, so a big batch can't
+        # take the total over `capacity`
+        added = ordered[new]
+        half = max(1, self.capacity // 2)
+        while len(added):
+            piece, added = np.split(added, [half - len(self.current)])
+            self.current = np.insert(self.current,
+                                     np.searchsorted(self.current, piece), piece)
+            if len(self.current) >= half:
+                self.previous, self.current = self.current, np.empty(0, dtype=np.uint64)
+        return fresh
+
+
+def deduplicate(batches: Iterable[np.ndarray], grid_shape: Tuple[int, int],
+                capacity: int = 10_000_000) -> Iterator[np.ndarray]:
+    """
+    Stream batches of grids with repeats, up to symmetry, left out
+    (see `Symmetry` and `Deduplicator`)
+    """
+    symmetry = Symmetry(grid_shape)
+    seen = Deduplicator(capacity)
+    for grids in batches:
+        yield grids[seen.add(symmetry.canonical_hashes(grids))]
@@ -0,0 +1,152 @@
+from typing import Callable, Tuple
+
+import tkinter as tk
+from tkinter.font import Font
+
+import numpy as np
+
+from sweeper.gui.cell import Cell
+
+
+class CanvasBoard(tk.Canvas):
+    """
+    The whole grid drawn on one canvas, instead of a Cell button
+    per cell
+
+    Every cell is a rectangle, a text and an image item, made once.
+    The font is shared and images are passed in, as for Cell. One
+    handler for each mouse button works out the cell from the
+    pixel clicked.
+
+    The items of each kind share a tag, so a new game puts every
+    cell back with three `itemconfigure` calls, and a click only
+    reconfigures the items of the cells it changed.
+    """
+    UNCLICKED_FILL = "white"
+    CLICKED_FILL = "gray"
+    SPECIAL_FILL = "red"
+    GAP = 1 #  pixels between cells, as the buttons' padding
+
+    def __init__(self,
+                 master: tk.Misc,
+                 shape: Tuple[int, int],
+                 size: int,
+                 on_click: Callable[[Tuple[int, int]], None],
+                 on_right_click: Callable[[Tuple[int, int]], None]):
+        """
+        Parameters
+        ----------
+        master: tk.Misc
+            Owner of the canvas
+        shape: tuple[int, int]
+            Grid shape
+        size: int
+            Size of each cell in pixels
+        on_click, on_right_click:
+            Called with the (row, column) of a left or right click
+        """
+        self.shape = tuple(shape)
+        self.size = size #  [pixels]
+        self.pitch = size + 2 * self.GAP
+        rows, columns = self.shape
+        super().__init__(master, width=columns * self.pitch,
+                         height=rows * self.pitch, highlightthickness=0,
+                         bg=self.CLICKED_FILL)
+        self.font = Font(family="Arial Rounded MT Bold", size=20)
+        self.on_click = on_click
+        self.on_right_click = on_right_click
+
+        self.rectangles = np.empty(self.shape, dtype=np.int64)
+        self.texts = np.empty(self.shape, dtype=np.int64)
+        self.images = np.empty(self.shape, dtype=np.int64)
+        for i in range(rows):
+            for j in range(columns):
+                x, y = j * self.pitch + self.GAP, i * self.pitch + self.GAP
+                self.rectangles[i, j] = self.create_rectangle(
+                    x, y, x + size, y + size, fill=self.UNCLICKED_FILL,
+                    outline="black", tags=("cell",))
+                centre = (x + size // 2, y + size // 2)
+                self.texts[i, j] = self.create_text(
+                    *centre, text='', font=self.font, tags=("text",))
+                self.images[i, j] = self.create_image(
+                    *centre, anchor=tk.CENTER, tags=("image",))
+        self.state = np.full(self.shape, Cell.STATES.UNCLICKED, dtype=np.int8)
+
+        self.bind("<Button-1>", lambda event: self._dispatch(event, self.on_click))
+        self.bind("<Button-3>", lambda event: self._dispatch(event, self.on_right_click))
+
+    def cell_at(self, x: int, y: int) -> Tuple[int, int] | None:
+        """The (row, column) under a pixel, None off the grid"""
+        i, j = int(y) // self.pitch, int(x) // self.pitch
+        if 0 <= i < self.shape[0] and 0 <= j < self.shape[1]:
+            return i, j
+        return None
+
+    def _dispatch(self, event: tk.Event, handler: Callable) -> None:
+        coord = self.cell_at(event.x, event.y)
+        if coord is not None:
+            handler(coord)
+
+    def reset(self) -> None:
+        """Put every cell back to unclicked, in one pass"""
+        self.itemconfigure("cell", fill=self.UNCLICKED_FILL)
+        self.itemconfigure("text", text='')
+        self.itemconfigure("image", image='')
+        self.state[:] = Cell.STATES.UNCLICKED
+
+    def left_click(self, coords: Tuple[np.ndarray, np.ndarray],
+                   values: np.ndarray) -> None:
+        """
+        Show the values of revealed cells, as Cell.left_click. Cells
+        already clicked are left alone
+
+        Parameters
+        ----------
+        coords: tuple[np.ndarray, np.ndarray]
+            Row and column arrays of the cells
+        values: np.ndarray
+            Their values, all 0 or more
+        """
+        dirty = self.state[coords] != Cell.STATES.CLICKED
+        coords = tuple(c[dirty] for c in coords)
+        for rectangle, text, image, value in zip(self.rectangles[coords].tolist(),
+                                                 self.texts[coords].tolist(),
+                                                 self.images[coords].tolist(),
+                                                 values[dirty].tolist()):
+            self.itemconfigure(rectangle, fill=self.CLICKED_FILL)
+            if value > 0:
+                self.itemconfigure(text, text=str(value), fill=Cell.COLOURS[value])
+            self.itemconfigure(image, image='')
+        self.state[coords] = Cell.STATES.CLICKED
+
+    def right_click(self, coord: Tuple[int, int], flag_image: tk.PhotoImage) -> None:
+        """Toggle a flag on an unclicked cell, as Cell.right_click"""
+        if self.state[coord] == Cell.STATES.UNCLICKED:
+            self.itemconfigure(int(self.images[coord]), image=flag_image)
+            self.state[coord] = Cell.STATES.FLAGGED
+        elif self.state[coord] == Cell.STATES.FLAGGED:
+            self.itemconfigure(int(self.images[coord]), image='')
+            self.state[coord] = Cell.STATES.UNCLICKED
+
+    def reveal(self, cells: np.ndarray, image: tk.PhotoImage | None = None,
+               special: bool = False) -> None:
+        """
+        Reveal cells on the game being won or lost, as Cell.reveal
+
+        Parameters
+        ----------
+        cells: np.ndarray
+            (row, column) of each cell, shape (N, 2)
+        image: tk.PhotoImage | None
+            Could be lad or bomb
+        special: bool
+            Highlight the cells, for the mine that lost the game or
+            wrongly placed flags
+        """
+        coords = tuple(np.asarray(cells).reshape(-1, 2).T)
+        fill = self.SPECIAL_FILL if special else self.CLICKED_FILL
+        for rectangle, item in zip(self.rectangles[coords].tolist(),
+                                   self.images[coords].tolist()):
+            self.itemconfigure(rectangle, fill=fill)
+            self.itemconfigure(item, image=image if image else '')
+        self.state[coords] = Cell.STATES.CLICKED
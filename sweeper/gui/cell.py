@@ -60,16 +60,18 @@ class Cell(tk.Button):
 
     def left_click(self, value: int) -> None:
         """
-        Called if a cell is left clicked. Only has effect if the
-        cell state is unclicked
+        Called if a cell is left clicked, or revealed by a click
+        elsewhere. Only has effect if the cell isn't clicked yet,
+        a wrongly placed flag is taken off
 
         Parameters
         ----------
         value: int
             The value of the cell, with a default of 0
         """
-        if self.state is self.STATES.UNCLICKED:
+        if self.state is not self.STATES.CLICKED:
             self.config(text=str(value) if value > 0 else '',
+                        image=self.zero_image,
                         fg=self.COLOURS[value],
                         bg="gray",
                         **self.CLICKED)
@@ -112,8 +114,4 @@ class Cell(tk.Button):
     def reset(self):
         """Reset to start values"""
         self.config(height=self.size, width=self.size, **self.UNCLICKED)
-        self.state = self.STATES.UNCLICKED
-
-    def disable(self):
-        """No more clicks"""
-        self.state = self.STATES.CLICKED
\ No newline at end of file
+        self.state = self.STATES.UNCLICKED
\ No newline at end of file
@@ -1,5 +1,6 @@
 import tkinter as tk
-from time import time
+from math import ceil
+from time import monotonic
 
 from sweeper.gui.three_digit_display import ThreeDigitDisplay
 
@@ -11,30 +12,44 @@ class Clock(ThreeDigitDisplay):
     game being over (win or lose), or the time reaching
     999.
 
-    The clock works by calling the update function
-    every `UPDATE_TIME` ms. There may be a better way
-    to do it than that.
+    The display only changes once a second, so rather than
+    polling, the clock asks tk to wake it just after the next
+    whole second since the start, by the monotonic clock. A
+    running clock wakes once a second, and a stopped one never.
     """
-    UPDATE_TIME = 10 #  [ms]
+    MAX_TIME = 999 #  [s]
     def __init__(self, master: tk.Tk):
         super().__init__(master)
 
         self.stopped = True
-        self.start_time: float #  start time from time()
+        self.start_time: float #  start time from monotonic()
+        self._wakeup: str | None = None #  id of the pending `after`
 
     def start_timer(self):
         if not self.stopped:
             return # clock already running
         self.stopped = False
-        self.start_time = time()
+        self.start_time = monotonic()
         self.value = 0
         self.update_timer()
 
     def update_timer(self):
-        self.value=(int(time()-self.start_time))
+        self._wakeup = None
         if self.stopped:
             return
-        self.master.after(self.UPDATE_TIME, self.update_timer)
+        elapsed = monotonic() - self.start_time
+        self.value = int(elapsed)
+        if self.value >= self.MAX_TIME:
+            self.stopped = True
+            return
+        # +1 ms so rounding never wakes us just short of the second
+        delay = ceil((int(elapsed) + 1 - elapsed) * 1000) + 1
+        self._wakeup = self.master.after(delay, self.update_timer)
 
     def stop_timer(self):
+        if not self.stopped:
+            self.value = int(monotonic() - self.start_time)
         self.stopped = True
+        if self._wakeup is not None:
+            self.master.after_cancel(self._wakeup)
+            self._wakeup = None
@@ -11,17 +11,28 @@ import numpy as np
 from sweeper.lad_sweeper import LadSweeper
 
 from sweeper.gui.image_handler import ImageHandler
+from sweeper.gui.canvas_board import CanvasBoard
 from sweeper.gui.cell import Cell
 
 
 class LadSweeperApp():
-
+    """
+    The lad sweeper window. The grid is drawn either as a Cell
+    button per cell ("buttons"), or all on one CanvasBoard
+    ("canvas"), which is much quicker to build and reset for
+    large boards
+    """
     CELL_SIZE = 50 # pixels
+    RENDERERS = ("buttons", "canvas")
 
     def __init__(self,
                  master: tk.Tk,
                  shape: Tuple[int, int]=(16, 30),
-                 num_mines: int=99):
+                 num_mines: int=99,
+                 renderer: str="buttons"):
+        if renderer not in self.RENDERERS:
+            raise ValueError(f"renderer must be one of {self.RENDERERS}, "
+                             f"not {renderer!r}")
         self.master = master
         master.title("LadSweeper")
 
@@ -35,9 +46,15 @@ class LadSweeperApp():
         self.banner.pack(side=tk.TOP)
 
         self.buttons_frame = tk.Frame(master)
-        self.buttons  = self.make_buttons(self.buttons_frame, *shape)
+        self.canvas: CanvasBoard | None = None
+        self.buttons: List[List[Cell]] = []
+        if renderer == "canvas":
+            self.canvas = CanvasBoard(self.buttons_frame, shape, self.CELL_SIZE,
+                                      self.on_click, self.on_right_click)
+            self.canvas.pack()
+        else:
+            self.buttons = self.make_buttons(self.buttons_frame, *shape)
         self.buttons_frame.pack(side=tk.BOTTOM)
-        self.flags: List[Tuple[int, int]]=[]
 
 
     def make_banner(self, master):
@@ -53,10 +70,12 @@ class LadSweeperApp():
     def new_game(self):
         self.game.new_game()
         self.reset_buttons()
-        self.flags = []
         self.new_game_button.config(image=self.images["lad"])
 
     def reset_buttons(self):
+        if self.canvas is not None:
+            self.canvas.reset()
+            return
         for row in self.buttons:
             for button in row:
                 button.reset()
@@ -74,29 +93,77 @@ class LadSweeperApp():
         return buttons
 
     def on_click(self, coord: Tuple[int, int]):
-        if self.buttons[coord[0]][coord[1]].state is self.buttons[0][0].STATES.CLICKED:
+        if self.game.game_won is not None or self.game.visible[coord]:
             return
-        for i, j in self.game.click_cell(coord):
-            value = self.game.board[i, j]
-            self.buttons[i][j].left_click(value)
+        hidden = self.game.visible == 0
+        coords, values = self.game.click(coord)
+        self.update_cells(coords, values)
         if self.game.game_won is not None:
-            self.reveal_board(coord) # need the coord incase it was a mine
-        
+            hidden[coords] = False
+            self.reveal_board(coord, hidden) # need the coord incase it was a mine
+
+    def update_cells(self, coords: Tuple[np.ndarray, np.ndarray],
+                     values: np.ndarray):
+        """
+        Show the cells revealed by a click, all in one redraw
+
+        Parameters
+        ----------
+        coords: tuple[np.ndarray, np.ndarray]
+            Row and column arrays of the cells, from `LadSweeper.click`
+        values: np.ndarray
+            Their values
+        """
+        safe = values >= 0
+        if self.canvas is not None:
+            self.canvas.left_click(tuple(c[safe] for c in coords), values[safe])
+        else:
+            for i, j, value in zip(*(c[safe].tolist() for c in coords),
+                                   values[safe].tolist()):
+                self.buttons[i][j].left_click(value)
+        self.master.update_idletasks()
+
     def on_right_click(self, coord):
         """
         Toggle a flag on the cell
         """
+        if self.game.game_won is not None or self.game.visible[coord]:
+            return
         i, j = coord
-        if coord in self.flags:
-            self.buttons[i][j].right_click(self.images["flag"])
-            self.flags.remove(coord)
-        elif self.buttons[i][j].state is self.buttons[i][j].STATES.UNCLICKED:
+        self.game.toggle_flag(coord)
+        if self.canvas is not None:
+            self.canvas.right_click(coord, self.images["flag"])
+        else:
             self.buttons[i][j].right_click(self.images["flag"])
-            self.flags.append(coord)
 
-    def reveal_board(self, coord: Tuple[int, int]):
+    def reveal_cells(self, cells: np.ndarray, image: tk.PhotoImage | None=None,
+                     special: bool=False):
+        """
+        Reveal cells at the end of a game, see Cell.reveal
+
+        Parameters
+        ----------
+        cells: np.ndarray
+            (row, column) of each cell, shape (N, 2)
+        """
+        if self.canvas is not None:
+            self.canvas.reveal(cells, image, special)
+            return
+        for i, j in cells.tolist():
+            self.buttons[i][j].reveal(image, special)
+
+    def reveal_board(self, coord: Tuple[int, int], hidden: np.ndarray):
         """
-        On the game being won / lost reveal the board
+        On the game being won / lost reveal the board. Only the
+        cells that were still hidden are touched, and the rest
+        ignore clicks until the next game
+
+        Parameters
+        ----------
+        coord: tuple[int, int]
+            The last click
+        hidden: np.ndarray
+            bool mask of the cells not revealed during the game
         """
         if self.game.game_won is True:
             self.new_game_button.config(image=self.images["winning_lad"])
@@ -104,21 +171,20 @@ class LadSweeperApp():
         else:
             self.new_game_button.config(image=self.images["lad_rear"])
             img = self.images["dead_lad"]
-        for i, row in enumerate(self.buttons):
-            for j, button in enumerate(row):
-                value = self.game.board[i][j]
-                button.disable()
-                if value < 0:
-                    if (i, j) in self.flags:
-                        continue
-                    if (i, j) == coord: # losing mine
-                        button.reveal(img, special=True)
-                    else:
-                        button.reveal(img)
-                elif (i, j) in self.flags: # incorrect flag
-                    button.reveal(self.images["flag"], special=True)
-                else: # Don't change, but do disable
-                    button.reveal() # just disables
+        board = self.game.board
+        flagged = self.game.flagged
+        mines = (board < 0) & ~flagged
+        losing = board[coord] < 0
+        mines[coord] = False
+        self.reveal_cells(np.argwhere(mines), img)
+        if losing:
+            self.reveal_cells(np.array([coord]), img, special=True)
+        # incorrect flags
+        self.reveal_cells(np.argwhere((board >= 0) & flagged),
+                          self.images["flag"], special=True)
+        # Don't change, but do disable
+        self.reveal_cells(np.argwhere(hidden & (board >= 0) & ~flagged))
+        self.master.update_idletasks()
 
 
 if __name__ == "__main__":
@@ -1,14 +1,31 @@
+from collections import OrderedDict
+from importlib.resources import files
 from pathlib import Path
+from typing import Dict, Tuple
 
 from PIL import Image, ImageTk
 
+# The images shipped in the package, wherever it's installed
+ASSET_DIR = files("sweeper.gui") / "assets" / "images"
+
+
 class ImageHandler:
     """
     Handles the opening and sizing of the images needed
     for lad-sweeper
 
     The class can be used like a dictionary where values
-    can only be read, not set.
+    can only be read, not set, giving the images at the
+    current `size`.
+
+    Nothing is decoded up front. Each image is opened the first
+    time it's asked for, and each size of it is made once and kept
+    in a least recently used cache keyed by (name, size), so going
+    back to a size seen before, e.g. when zooming, costs nothing.
+    The images at the current size are never evicted, as widgets
+    may be showing them. With `disk_cache` the resized images are
+    also saved as PNGs, so later runs don't decode the full size
+    sources at all.
 
     Images
     ------
@@ -18,35 +35,119 @@ class ImageHandler:
     lad_rear
     winning_lad
     """
-    def __init__(self, size: int, filepath: Path=Path("assets/images/")):
+    def __init__(self,
+                 size: int,
+                 filepath: Path=ASSET_DIR,
+                 cache_size: int=32,
+                 disk_cache: Path | None=None):
         """
         Parameters
         ----------
         size: int
             The size the images should be in pixels
         filepath: Path
-            Path to lad images folder
+            Path to lad images folder, or an importlib.resources
+            Traversable, the package's by default
+        cache_size: int
+            Most resized images kept in memory
+        disk_cache: Path | None
+            Folder to keep resized images in between runs, created
+            if missing. None to not use one
+
+        Raises
+        ------
+        FileNotFoundError
+            If there are no PNG images in `filepath`
         """
         self.image_root = filepath
-        self.raw_images = dict((path.stem, Image.open(path))
-                               for path in self.image_root.iterdir())
-        
+        # Only the file names are read now
+        self.paths = {path.name[:-len(".png")]: path
+                      for path in (self.image_root.iterdir()
+                                   if self.image_root.is_dir() else ())
+                      if path.name.endswith(".png")}
+        if not self.paths:
+            raise FileNotFoundError(f"no .png images found in {self.image_root}, "
+                                    f"the lad sweeper assets are missing")
+        self.raw_images: Dict[str, Image.Image] = {}
+        self.cache_size = cache_size
+        self.disk_cache = None if disk_cache is None else Path(disk_cache)
+        if self.disk_cache is not None:
+            self.disk_cache.mkdir(parents=True, exist_ok=True)
+        self.images: OrderedDict[Tuple[str, int], ImageTk.PhotoImage] = OrderedDict()
+
         self.size = size #  Image size in pixels
-        self.images: dict[str, ImageTk.PhotoImage]
-        
-    def __getitem__(self, key: str):
-        return self.images[key]
-    
+
+    def __getitem__(self, key: str) -> ImageTk.PhotoImage:
+        return self.get(key, self.size)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.paths
+
     @property
     def size(self) -> int:
         return self._size
-    
+
     @size.setter
     def size(self, value: int) -> None:
         """
-        Set the new size value, and make sure all of the
-        images are resized
+        Set the new size value. Images at this size are made as
+        they're asked for
         """
         self._size = value
-        self.images = {key: ImageTk.PhotoImage(img.resize((value, value)))
-                        for key, img in self.raw_images.items()}
\ No newline at end of file
+
+    def get(self, name: str, size: int) -> ImageTk.PhotoImage:
+        """
+        One image at any size, from the cache if it's been made
+
+        Raises
+        ------
+        KeyError
+            If there is no image called `name`
+        """
+        key = (name, size)
+        if key in self.images:
+            self.images.move_to_end(key)
+            return self.images[key]
+        if name not in self.paths:
+            raise KeyError(name)
+        image = ImageTk.PhotoImage(self.resized(name, size))
+        self.images[key] = image
+        self.evict()
+        return image
+
+    def resized(self, name: str, size: int) -> Image.Image:
+        """
+        An image resized to `size`, read from the disk cache if it's
+        there and newer than the source image
+        """
+        source = self.paths[name]
+        cached = (None if self.disk_cache is None
+                  else self.disk_cache / f"{name}_{size}.png")
+        # Installed assets may not be plain files with a stat
+        source_time = source.stat().st_mtime if isinstance(source, Path) else 0
+        if (cached is not None and cached.exists()
+                and cached.stat().st_mtime >= source_time):
+            with Image.open(cached) as image:
+                image.load()
+                return image
+        if name not in self.raw_images:
+            with source.open("rb") as file, Image.open(file) as image:
+                image.load()
+                self.raw_images[name] = image
+        image = self.raw_images[name].resize((size, size))
+        if cached is not None:
+            image.save(cached)
+        return image
+
+    def evict(self) -> None:
+        """
+        Drop the least recently used images over `cache_size`,
+        except those at the current size
+        """
+        excess = len(self.images) - self.cache_size
+        for key in list(self.images):
+            if excess <= 0:
+                break
+            if key[1] != self.size:
+                del self.images[key]
+                excess -= 1
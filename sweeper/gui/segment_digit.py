@@ -70,7 +70,9 @@ class Digit(tk.Canvas):
         rotated = (False, True, True, False, True, True, False)
 
         for x, y, rotated in zip(seg_x_coords, seg_y_coords, rotated):
-            self.make_segment((x, y), rotated)                            
+            self.make_segment((x, y), rotated)
+        # Which segments are lit, all drawn off to start with
+        self.segments = self.NUMBERS[None]
 
     def make_segment(self, coord: tuple[int, int],
                      rotated: bool=False) -> None:
@@ -91,7 +93,8 @@ class Digit(tk.Canvas):
 
     def set_value(self, val: str | None) -> None:
         """
-        Set the display to val
+        Set the display to val. Only the segments that change are
+        repainted
 
         valid values for val:
             - [0-9]
@@ -99,8 +102,8 @@ class Digit(tk.Canvas):
             - None
         Otherwise it defaults to None
         """
-        for i, val in enumerate(self.NUMBERS.get(val, self.NUMBERS[None]), 1):
-            if val:
-                self.itemconfig(i, fill=self.ON_COLOUR)
-            else:
-                self.itemconfig(i, fill=self.OFF_COLOUR)
+        segments = self.NUMBERS.get(val, self.NUMBERS[None])
+        for i, (old, new) in enumerate(zip(self.segments, segments), 1):
+            if old != new:
+                self.itemconfig(i, fill=self.ON_COLOUR if new else self.OFF_COLOUR)
+        self.segments = segments
@@ -5,9 +5,13 @@ from sweeper.gui.segment_digit import Digit
 class ThreeDigitDisplay(tk.Frame):
     """
     Display values between -99 and 999 on a 7seg display
+
+    Setting the value it already shows does nothing, and each
+    digit only repaints the segments that change
     """
     def __init__(self, master):
         super().__init__(master, bg="black", bd=0)
+        self._value: str | None = None
         self.digits = [Digit(self) for _ in range(3)]
         for i, digit in enumerate(self.digits):
             digit.grid(row=0, column=i, padx=0, pady=0, ipadx=0, ipady=0)
@@ -20,6 +24,9 @@ class ThreeDigitDisplay(tk.Frame):
 
     @value.setter
     def value(self, value: int) -> None:
-        self._value = f"{max(-99, min(value, 999)):03d}"
+        text = f"{max(-99, min(value, 999)):03d}"
+        if text == self._value:
+            return
+        self._value = text
         for digit, char in zip(self.digits, self._value):
             digit.set_value(char)
@@ -3,20 +3,40 @@ from itertools import product
 
 import numpy as np
 
+from sweeper.data.board_pool import BoardPool, clear_around
 from sweeper.data.grid_generator import GridGenerator
+from sweeper.data.openings import label_openings, opening_masks
+from sweeper.reveal import neighbour_table, flood_reveal
 
 class LadSweeper:
     """
     I've crammed minesweeper into this class. Could probably
     be split into a few but whatevs.
+
+    The game state is kept as running counters (`revealed`,
+    `safe_remaining`, `flags_placed`) updated by each click, so
+    checking for a win and reading the board are O(1).
+
+    With `use_pool` boards come from a BoardPool filled in the
+    background, so starting a game doesn't wait on generation.
+    With `first_click_safe` the first click of each game is safe,
+    and a 0 when the density allows: the board is swapped for one
+    with a 0 there, or the mines around the click are moved away.
     """
     MAX_BOARD_SIZE = 50
+    # (shape, num_mines) of the standard difficulties
+    PRESETS = {"beginner": ((9, 9), 10),
+               "intermediate": ((16, 16), 40),
+               "expert": ((16, 30), 99)}
     NEIGHBOURS = [(i, j) for i, j in product(*((1, 0, -1),)*2)
                   if not (i == j == 0)] #  lmao
 
     def __init__(self,
                  shape: Tuple[int, int]=(16, 32),
-                 num_mines: int=99):
+                 num_mines: int=99,
+                 seed=None,
+                 use_pool: bool=False,
+                 first_click_safe: bool=False):
         """
         The default values are for 'expert' lad sweeper
 
@@ -26,21 +46,43 @@ class LadSweeper:
             Lad-sweeper grid shape
         num_mines: int
             Number of mines to place in the lad-sweeper grid
+        seed: int | np.random.SeedSequence | None
+            Seed for the grid generator, so a run of games can be
+            replayed
+        use_pool: bool
+            Take boards from a BoardPool, close it with `close`
+        first_click_safe: bool
+            Make sure the first click of every game is safe, and
+            opens a region when the density allows
         """
+        self.seed = seed
+        self.use_pool = use_pool
+        self.first_click_safe = first_click_safe
+        self.board_pool: BoardPool | None = None
+        # Set directly rather than through the setters, which would
+        # each make a generator and board pool
         self._shape = shape
-        self._num_mines = num_mines
         self._size = shape[0] * shape[1]
-
-        self.shape = shape
-        self.num_mines = num_mines # make sure value is legit
-
-        self.grid_generator = GridGenerator(grid_shape=shape, num_mines=num_mines)
+        self.neighbour_table = neighbour_table(shape)
+        self._num_mines = max(1, min(num_mines, self.size - 1)) # make sure value is legit
+        self.make_generator()
 
         # None if game in progress, True if win, False if lost
         self.game_won: bool | None = None
 
         self._board: np.ndarray
         self.visible: np.ndarray
+        # Opening label of every 0 cell, and the cells each opening
+        # reveals, worked out once per board when first needed
+        self._opening_labels: np.ndarray | None = None
+        self._openings: np.ndarray | None = None
+
+        # The board as the player sees it, 0 for unseen cells
+        self._visible_board: np.ndarray
+        self.flagged: np.ndarray
+        self.revealed: int #  safe cells revealed so far
+        self.safe_remaining: int #  safe cells still to reveal
+        self.flags_placed: int
 
         self.new_game()
 
@@ -52,8 +94,8 @@ class LadSweeper:
     def shape(self, value: tuple[int, int]):
         self._shape = value
         self._size = value[0] * value[1]
-        self.grid_generator = GridGenerator(grid_shape=self.shape,
-                                            num_mines=self.num_mines)
+        self.neighbour_table = neighbour_table(value)
+        self.make_generator()
 
     @property
     def size(self) -> int:
@@ -65,15 +107,83 @@ class LadSweeper:
     
     @num_mines.setter
     def num_mines(self, value: int):
-        self._num_mines = min(1, max(value, self.size))
+        self._num_mines = max(1, min(value, self.size - 1))
+        self.make_generator()
+
+    def make_generator(self) -> None:
+        """
+        Make the grid generator, and board pool if used, for the
+        current shape and number of mines
+        """
         self.grid_generator = GridGenerator(grid_shape=self.shape,
-                                            num_mines=self.num_mines)
+                                            num_mines=self.num_mines,
+                                            seed=self.seed)
+        if self.board_pool is not None:
+            self.board_pool.close()
+            self.board_pool = None
+        if self.use_pool:
+            self.board_pool = BoardPool(self.grid_generator)
+
+    def close(self) -> None:
+        """
+        Stop the board pool's thread, if there is one. New games
+        come straight from the generator after this
+        """
+        if self.board_pool is not None:
+            self.board_pool.close()
+            self.board_pool = None
+            self.use_pool = False
 
     def new_game(self) -> None:
-        self._board = next(self.grid_generator)
+        if self.board_pool is not None:
+            self.set_board(self.board_pool.get())
+        else:
+            self.set_board(next(self.grid_generator))
         self.visible = np.zeros(self.shape, dtype=np.int8)
+        self._visible_board = np.zeros(self.shape, dtype=np.int8)
+        self.flagged = np.zeros(self.shape, dtype=bool)
+        self.revealed = 0
+        self.safe_remaining = int(np.count_nonzero(self._board >= 0))
+        self.flags_placed = 0
         self.game_won = None
 
+    def set_board(self, board: np.ndarray) -> None:
+        """
+        Put a complete grid in play. Its openings are indexed on
+        the first reveal, so starting a game costs next to nothing
+        """
+        self._board = board
+        self._opening_labels = None
+        self._openings = None
+
+    @property
+    def opening_labels(self) -> np.ndarray:
+        """The opening number of every 0 cell, see `label_openings`"""
+        if self._opening_labels is None:
+            self._opening_labels = label_openings(self._board[None])[0]
+        return self._opening_labels
+
+    @property
+    def openings(self) -> np.ndarray:
+        """The cells each opening reveals, see `opening_masks`"""
+        if self._openings is None:
+            self._openings = opening_masks(self.opening_labels)
+        return self._openings
+
+    def clear_first_click(self, coord: Tuple[int, int]) -> None:
+        """
+        Before the first reveal of a `first_click_safe` game, make
+        sure `coord` is safe, and a 0 when the density allows
+        """
+        if self._board[coord] == 0:
+            return
+        if self.board_pool is not None:
+            self.set_board(self.board_pool.get(first_click=coord))
+        else:
+            board = clear_around(self._board.copy(), coord, self.num_mines,
+                                 self.grid_generator.rng)
+            self.set_board(board)
+
     def get_neighbours(self,
                        coord: Tuple[int, int]) -> Tuple[Tuple[int, int]]:
         """
@@ -103,50 +213,97 @@ class LadSweeper:
             return True
         return False
 
-    def click_cell(self,
-                   coord: Tuple[int, int]) -> Set[Tuple[int, int]]:
+    def click(self, coord: Tuple[int, int]
+              ) -> Tuple[Tuple[np.ndarray, np.ndarray], np.ndarray]:
         """
-        Pass on a cell coordinate to the board.
+        Click a cell, and return only what changed on the board as
+        the player sees it, so a front end can redraw those cells
+        and nothing else.
 
         Update the gamestate corresponding to the
         value of the revealed cell.
+
+        Returns
+        -------
+        coords: tuple[np.ndarray, np.ndarray]
+            Row and column arrays of the newly revealed cells. Just
+            the clicked cell if it was a mine
+        values: np.ndarray
+            The board value of each of those cells
         """
-        result = self.recurse(coord)
-        if self.check_win():
-            self.game_won = True
-        if len(result) == 0: # Gameover
-            self.game_won = False
+        if self.first_click_safe and self.revealed == 0:
+            self.clear_first_click(coord)
+        if self._board[coord] < 0: # Game over
+            self._visible_board[:, :] = self._board
             self.visible[:, :] = 1
-        return result
+            self.game_won = False
+            coords = (np.array([coord[0]]), np.array([coord[1]]))
+        else:
+            coords = self.reveal(coord)
+            if self.check_win():
+                self.game_won = True
+        return coords, self._board[coords]
+
+    def click_cell(self,
+                   coord: Tuple[int, int]) -> Set[Tuple[int, int]]:
+        """
+        Pass on a cell coordinate to the board.
+
+        Returns
+        -------
+        The set of revealed coordinates, including the clicked
+        cell. Empty if it was a mine
+        """
+        (rows, columns), _ = self.click(coord)
+        if self.game_won is False:
+            return set()
+        return set(zip(rows.tolist(), columns.tolist())) | {coord}
 
-    def recurse(self, coord: Tuple[int, int],
-                found: set[Tuple[int, int]] | None=None) -> Set[Tuple[int, int]]:
+    def reveal(self, coord: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
         """
-        Recursively reveal cells around a clicked cell.
+        Reveal a cell that isn't a mine, and the whole region
+        around it if it's a 0. The region is looked up from the
+        board's opening index, built on its first reveal.
 
         Returns
         -------
-        coords: set[Tuple[int, int]]
-            - empty if game over (mine was clicked)
-            - single tuple for a number clicked
-            - several tuples if a 0 was clicked
-        """
-        if self._board[coord] < 0:
-            return set() # Game over
-        if found is None:
-            found = set()
+        coords: tuple[np.ndarray, np.ndarray]
+            Row and column arrays of the newly revealed cells,
+            ready for fancy indexing. Empty if the cell was
+            already visible
+        """
+        visible = self.visible.reshape(-1)
+        opening = self.opening_labels[coord]
+        if opening:
+            revealed = np.flatnonzero(self.openings[opening] & (visible == 0))
+            visible[revealed] = 1
+        else:
+            start = np.ravel_multi_index(coord, self.shape)
+            revealed = flood_reveal(self._board.reshape(-1), visible,
+                                    start, self.neighbour_table)
+        self._visible_board.reshape(-1)[revealed] = self._board.reshape(-1)[revealed]
+        self.revealed += len(revealed)
+        self.safe_remaining -= len(revealed)
+        # Any flags wrongly placed on revealed cells come off
+        flagged = self.flagged.reshape(-1)
+        self.flags_placed -= int(np.count_nonzero(flagged[revealed]))
+        flagged[revealed] = False
+        return np.unravel_index(revealed, self.shape)
+
+    def toggle_flag(self, coord: Tuple[int, int]) -> bool:
+        """
+        Flag an unseen cell, or unflag a flagged one. Revealed
+        cells can't be flagged.
+
+        Returns
+        -------
+        True if the cell is now flagged, else False
+        """
         if self.visible[coord]:
-            return found.union({coord})
-        if not self.visible[coord]:
-            self.visible[coord] = 1
-            found.add(coord)
-            if self._board[coord] != 0:
-                return found
-            else:
-                for neib in self.get_neighbours(coord):
-                    if neib not in found:
-                        found = found.union(self.recurse(neib, found))
-        return found
+            return False
+        self.flagged[coord] = not self.flagged[coord]
+        self.flags_placed += 1 if self.flagged[coord] else -1
+        return bool(self.flagged[coord])
 
     def check_win(self) -> bool:
         """
@@ -156,16 +313,28 @@ class LadSweeper:
         -------
         True if game is won, else false
         """
-        unseen = self._board[np.where(self.visible==0)]
-        if np.all(unseen < 0):
+        if self.safe_remaining == 0:
             self.visible[:, :] = 1
+            self._visible_board[:, :] = self._board
             return True
         else:
             return False
 
     @property
-    def board(self):
-        return np.where(self.visible, self._board, 0)
+    def mines_remaining(self) -> int:
+        """The mine count less the flags placed, as shown to the player"""
+        return self.num_mines - self.flags_placed
+
+    @property
+    def board(self) -> np.ndarray:
+        """
+        The board as the player sees it, 0 for unseen cells. This
+        is a read-only view, kept up to date by each click, not a
+        copy
+        """
+        view = self._visible_board.view()
+        view.flags.writeable = False
+        return view
 
 if __name__ == "__main__":
-    game = LadSweeper((10, 10), 15)
+    game = LadSweeper((10, 10), 15)
\ No newline at end of file
@@ -0,0 +1,75 @@
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+
+
+@lru_cache(maxsize=32)
+def neighbour_table(shape: Tuple[int, int]) -> np.ndarray:
+    """
+    Return the flat indices of the 8 neighbours of every cell on
+    a board of `shape`
+
+    Neighbours that fall off the board are given the index
+    `rows * columns`, one past the last cell, so the table is
+    rectangular. The table is cached per shape and read-only.
+
+    Returns
+    -------
+    table: np.ndarray
+        Array with shape (rows * columns, 8)
+    """
+    rows, columns = shape
+    size = rows * columns
+    padded = np.full((rows + 2, columns + 2), size, dtype=np.intp)
+    padded[1:-1, 1:-1] = np.arange(size).reshape(shape)
+    table = np.stack([padded[1 + i:rows + 1 + i, 1 + j:columns + 1 + j].ravel()
+                      for i in (-1, 0, 1) for j in (-1, 0, 1)
+                      if not i == j == 0], axis=1)
+    table.flags.writeable = False
+    return table
+
+
+def flood_reveal(board: np.ndarray,
+                 visible: np.ndarray,
+                 start: int,
+                 table: np.ndarray) -> np.ndarray:
+    """
+    Reveal the cell `start` and, if it is a 0, the connected
+    region of 0s and their bordering numbers
+
+    The fill works outwards a whole layer of cells at a time
+    using the neighbour table, so there is no recursion and no
+    per-cell Python work.
+
+    Parameters
+    ----------
+    board: np.ndarray
+        Flat board, -1 for mines and counts elsewhere
+    visible: np.ndarray
+        Flat visibility mask, updated in place
+    start: int
+        Flat index of the clicked cell. Must not be a mine
+    table: np.ndarray
+        The `neighbour_table` of the board's shape
+
+    Returns
+    -------
+    revealed: np.ndarray
+        Flat indices of the cells that were newly revealed
+    """
+    if visible[start]:
+        return np.empty(0, dtype=np.intp)
+    visible[start] = 1
+    revealed = [np.array([start], dtype=np.intp)]
+    frontier = revealed[0] if board[start] == 0 else revealed[0][:0]
+    size = len(board)
+    while len(frontier):
+        cells = np.unique(table[frontier])
+        if cells[-1] == size: #  off the board
+            cells = cells[:-1]
+        cells = cells[visible[cells] == 0]
+        visible[cells] = 1
+        revealed.append(cells)
+        frontier = cells[board[cells] == 0]
+    return np.concatenate(revealed)
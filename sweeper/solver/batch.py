@@ -0,0 +1,252 @@
+from typing import Tuple
+
+import numpy as np
+
+
+def popcount(x: np.ndarray) -> np.ndarray:
+    """Number of set bits in each element of a uint64 array"""
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2))
+                                             & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return ((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).astype(np.int64)
+
+
+def drop_repeats(cells: np.ndarray, seen: np.ndarray) -> np.ndarray:
+    """
+    Return the distinct indices in `cells`, sorted
+
+    `seen` is a scratch bool array with room for every index,
+    all False. The cells are marked in it and read back with one
+    pass, which is much faster than sorting when there are many,
+    and it's left all False again
+    """
+    seen[cells] = True
+    distinct = np.flatnonzero(seen)
+    seen[distinct] = False
+    return distinct
+
+
+class BatchSolver:
+    """
+    Finds the certainly safe and certainly mined cells of many
+    partly revealed boards of one shape at once
+
+    Every revealed number is a row of a 0/1 constraint matrix over
+    the unknown cells around it. As those cells are always within
+    one step of the number, the matrix is stored sparsely: each
+    row is a bitmask over the 7x7 window centred on its number,
+    which also holds the row of every number it can overlap. The
+    window offsets, and the bits of each 3x3 neighbourhood inside
+    it, depend only on the shape and are worked out once.
+
+    Method
+    ------
+    Repeat over the whole batch until nothing new is found:
+    1. Build the window bitmask of every number still touching
+       unknown cells, gathering all boards' frontiers at once.
+       After the first round only the numbers near a newly found
+       cell are looked at again
+    2. Single rows: 0 mines left means every unknown is safe, as
+       many mines left as unknowns means every unknown is a mine
+    3. Pairs of rows (the elimination step, bounded by each cell
+       being 0 or 1): for a number A and a number B up to 2 cells
+       away, if A needs as many more mines than B as it has
+       unknowns outside B, those are mines and B's unknowns
+       outside A are safe
+    4. Scatter the found cells back onto the boards, and update
+       the mines left and unknowns around their neighbours
+
+    >>> solver = BatchSolver((16, 30))
+    >>> safe, mines = solver.solve(values, visible)
+    """
+    WINDOW = 7 #  cells across each row's bitmask window
+
+    def __init__(self, shape: Tuple[int, int]):
+        """
+        Parameters
+        ----------
+        shape: tuple[int, int]
+            Shape of every board passed to `solve`
+        """
+        self.shape = tuple(shape)
+        self.rows, self.columns = self.shape
+        self.pad = self.WINDOW // 2
+        self.padded_shape = (self.rows + 2 * self.pad,
+                             self.columns + 2 * self.pad)
+
+        # Flat offset in the padded board, and bit, of every cell in
+        # the window, row by row
+        reach = range(-self.pad, self.pad + 1)
+        self.window = [(i, j) for i in reach for j in reach]
+        self.offsets = np.array([i * self.padded_shape[1] + j
+                                 for i, j in self.window])
+
+        def neighbourhood_bits(centre_i: int, centre_j: int) -> np.uint64:
+            bits = 0
+            for bit, (i, j) in enumerate(self.window):
+                if (abs(i - centre_i) <= 1 and abs(j - centre_j) <= 1
+                        and not (i == centre_i and j == centre_j)):
+                    bits |= 1 << bit
+            return np.uint64(bits)
+
+        self.centre_bits = neighbourhood_bits(0, 0)
+        self.neighbours = [i * self.padded_shape[1] + j for i, j in self.window
+                           if max(abs(i), abs(j)) == 1]
+        # Every number whose neighbourhood can overlap the centre's
+        self.pairs = [(i * self.padded_shape[1] + j, neighbourhood_bits(i, j))
+                      for i in range(-2, 3) for j in range(-2, 3)
+                      if not i == j == 0]
+
+    def padded(self, boards: np.ndarray, fill) -> np.ndarray:
+        """Flat copies of the boards with `fill` all around"""
+        out = np.full((len(boards), *self.padded_shape), fill,
+                      dtype=boards.dtype)
+        out[:, self.pad:-self.pad, self.pad:-self.pad] = boards
+        return out.reshape(-1)
+
+    def solve(self,
+              values: np.ndarray,
+              visible: np.ndarray,
+              known_mines: np.ndarray | None = None
+              ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find every cell that single and pairwise deductions prove
+        safe or mined
+
+        Parameters
+        ----------
+        values: np.ndarray
+            Cell counts with shape (N, rows, columns). Only read
+            where `visible`
+        visible: np.ndarray
+            bool mask of the revealed cells, same shape
+        known_mines: np.ndarray | None
+            Optional bool mask of cells already known to be mines
+
+        Returns
+        -------
+        safe: np.ndarray
+            bool mask of unrevealed cells proven safe
+        mines: np.ndarray
+            bool mask of cells proven to be mines, including any
+            `known_mines`
+        """
+        N = len(values)
+        revealed = self.padded(visible.astype(bool), False)
+        numbers = self.padded(np.where(visible, values, 0).astype(np.int8), 0)
+        if known_mines is None:
+            known_mines = np.zeros(values.shape, dtype=bool)
+        mines = self.padded(known_mines.astype(bool), False)
+        safe = np.zeros_like(mines)
+        # Cells on the board, inside the padding
+        on_board = self.padded(np.ones(values.shape, dtype=bool), False)
+        unknown = on_board & ~revealed & ~mines
+
+        # Mines still to be found around every cell, and the number
+        # of unknown cells around it
+        remaining = numbers.copy()
+        unknown_around = np.zeros_like(numbers)
+        for offset in self.neighbours:
+            # cell k looks at cell k + offset. The padding keeps
+            # every board's cells from reaching the next board
+            here = slice(max(0, -offset), len(mines) - max(0, offset))
+            there = slice(max(0, offset), len(mines) - max(0, -offset))
+            remaining[here] -= mines[there]
+            unknown_around[here] += unknown[there]
+        frontier = np.flatnonzero(revealed & (unknown_around > 0))
+        seen = np.zeros(len(revealed), dtype=bool)
+
+        while len(frontier):
+            new_mines, new_safe = self.find(frontier, unknown, remaining,
+                                            revealed)
+            if not (len(new_mines) or len(new_safe)):
+                break
+            mines[new_mines] = True
+            safe[new_safe] = True
+            unknown[new_mines] = False
+            unknown[new_safe] = False
+            for offset in self.neighbours:
+                remaining[new_mines - offset] -= 1
+                unknown_around[new_mines - offset] -= 1
+                unknown_around[new_safe - offset] -= 1
+
+            # Only numbers within reach of a changed cell (inside
+            # its window) can find anything new
+            frontier = self.near(np.concatenate([new_mines, new_safe]),
+                                 revealed, unknown_around, seen)
+
+        def unpad(flat: np.ndarray) -> np.ndarray:
+            boards = flat.reshape(N, *self.padded_shape)
+            return boards[:, self.pad:-self.pad, self.pad:-self.pad].copy()
+        return unpad(safe), unpad(mines)
+
+    def find(self, frontier: np.ndarray, unknown: np.ndarray,
+             remaining: np.ndarray, revealed: np.ndarray
+             ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply the single and pairwise rules to the numbers at
+        `frontier`, all flat indices of padded boards
+
+        Returns
+        -------
+        mines, safe: np.ndarray
+            Flat indices of the unknown cells found to be mines,
+            and safe
+        """
+        windows = self.windows(frontier, unknown)
+        centre = windows & self.centre_bits
+        here = remaining[frontier].astype(np.int64)
+        found_mines = np.where(here == popcount(centre), centre, np.uint64(0))
+        found_safe = np.where(here == 0, centre, np.uint64(0))
+        for offset, bits in self.pairs:
+            other = frontier + offset
+            other_centre = windows & bits
+            only_here = centre & ~other_centre
+            only_there = other_centre & ~centre
+            rule = (revealed[other]
+                    & (here - remaining[other] == popcount(only_here)))
+            found_mines |= np.where(rule, only_here, np.uint64(0))
+            found_safe |= np.where(rule, only_there, np.uint64(0))
+        return (self.scatter(frontier, found_mines, unknown),
+                self.scatter(frontier, found_safe, unknown))
+
+    def near(self, changed: np.ndarray, revealed: np.ndarray,
+             unknown_around: np.ndarray, seen: np.ndarray) -> np.ndarray:
+        """
+        The revealed numbers touching unknowns within reach (inside
+        the window) of the `changed` cells, which are the only ones
+        that can find anything new. `seen` is a scratch bool array
+        for `drop_repeats`
+        """
+        nearby = drop_repeats((changed[:, None] + self.offsets).reshape(-1),
+                              seen)
+        return nearby[revealed[nearby] & (unknown_around[nearby] > 0)]
+
+    def windows(self, cells: np.ndarray, unknown: np.ndarray) -> np.ndarray:
+        """
+        The unknown cell bitmask of the window around each of `cells`
+        """
+        windows = np.zeros(len(cells), dtype=np.uint64)
+        for bit, offset in enumerate(self.offsets):
+            windows |= unknown[cells + offset].astype(np.uint64) << np.uint64(bit)
+        return windows
+
+    def scatter(self, cells: np.ndarray, bits: np.ndarray,
+                unknown: np.ndarray) -> np.ndarray:
+        """
+        Turn window bitmasks back into flat indices of the padded
+        boards, keeping only cells that are still unknown
+        """
+        found = []
+        for bit, offset in enumerate(self.offsets):
+            hit = (bits >> np.uint64(bit)) & np.uint64(1) != 0
+            if hit.any():
+                found.append(cells[hit] + offset)
+        if not found:
+            return np.empty(0, dtype=np.intp)
+        found = np.sort(np.concatenate(found))
+        first = np.ones(len(found), dtype=bool)
+        np.not_equal(found[1:], found[:-1], out=first[1:])
+        found = found[first]
+        return found[unknown[found]]
@@ -0,0 +1,199 @@
+from typing import Dict, List, Set, Tuple
+
+import numpy as np
+
+from sweeper.lad_sweeper import LadSweeper
+
+
+class DeterministicSolver:
+    """
+    Finds the cells of a LadSweeper game that are certainly safe
+    or certainly mines, without guessing
+
+    Every revealed number with unknown neighbours is a constraint:
+    exactly `remaining` of its `unknowns` are mines. The solver
+    keeps these constraints and is told about each reveal, so it
+    only ever revisits the constraints around cells that changed
+    rather than rescanning the board.
+
+    Rules
+    -----
+    single point
+        0 mines left: every unknown is safe. As many mines left
+        as unknowns: every unknown is a mine
+    pairs
+        For overlapping constraints A and B, if A needs as many
+        more mines than B as it has cells outside B, those cells
+        are all mines and the cells of B outside A are all safe.
+        This covers the usual subset rule too
+
+    Use it step by step:
+    >>> solver = DeterministicSolver(game)
+    >>> safe, mines = solver.deduce()
+    >>> ... click the safe cells ...
+    >>> solver.update(revealed)
+    or let it play with `solve`.
+    """
+    def __init__(self, game: LadSweeper):
+        """
+        Parameters
+        ----------
+        game: LadSweeper
+            The game to solve. Cells already visible are taken in
+            straight away
+        """
+        self.game = game
+        self.size = game.size
+        self.neighbours: List[List[int]] = [
+            [n for n in row if n < self.size]
+            for row in game.neighbour_table.tolist()]
+
+        # Constraint of each revealed number still touching unknowns
+        self.unknowns: Dict[int, Set[int]] = {}
+        self.remaining: Dict[int, int] = {}
+        self.mines: Set[int] = set()
+        self.safe: Set[int] = set() #  known safe, not yet revealed
+        self.dirty: Set[int] = set() #  constraints to look at again
+
+        self.update(np.flatnonzero(game.visible))
+
+    def update(self, revealed) -> None:
+        """
+        Take in newly revealed cells
+
+        Parameters
+        ----------
+        revealed: iterable of int
+            Flat indices of the cells revealed since the last update
+        """
+        board = self.game.board.reshape(-1)
+        visible = self.game.visible.reshape(-1)
+        for cell in map(int, revealed):
+            self.safe.discard(cell)
+            for neighbour in self.neighbours[cell]:
+                unknowns = self.unknowns.get(neighbour)
+                if unknowns is not None and cell in unknowns:
+                    unknowns.discard(cell)
+                    self.touch(neighbour)
+
+            value = int(board[cell])
+            if value <= 0:
+                continue
+            unknowns = set()
+            for neighbour in self.neighbours[cell]:
+                if neighbour in self.mines:
+                    value -= 1
+                elif not visible[neighbour] and neighbour not in self.safe:
+                    unknowns.add(neighbour)
+            if unknowns:
+                self.unknowns[cell] = unknowns
+                self.remaining[cell] = value
+                self.dirty.add(cell)
+
+    def touch(self, cell: int) -> None:
+        """
+        Mark a constraint as changed, dropping it once it has no
+        unknowns left
+        """
+        if self.unknowns[cell]:
+            self.dirty.add(cell)
+        else:
+            del self.unknowns[cell]
+            del self.remaining[cell]
+            self.dirty.discard(cell)
+
+    def mark_mine(self, cell: int) -> None:
+        self.mines.add(cell)
+        for neighbour in self.neighbours[cell]:
+            unknowns = self.unknowns.get(neighbour)
+            if unknowns is not None and cell in unknowns:
+                unknowns.discard(cell)
+                self.remaining[neighbour] -= 1
+                self.touch(neighbour)
+
+    def mark_safe(self, cell: int) -> None:
+        self.safe.add(cell)
+        for neighbour in self.neighbours[cell]:
+            unknowns = self.unknowns.get(neighbour)
+            if unknowns is not None and cell in unknowns:
+                unknowns.discard(cell)
+                self.touch(neighbour)
+
+    def deduce(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Apply the rules to every changed constraint until nothing
+        more can be found
+
+        Returns
+        -------
+        safe: np.ndarray
+            Flat indices of every cell known to be safe that hasn't
+            been revealed yet
+        mines: np.ndarray
+            Flat indices of the mines found by this call
+        """
+        found_mines = []
+        while self.dirty:
+            a = self.dirty.pop()
+            unknowns_a = self.unknowns[a]
+            remaining_a = self.remaining[a]
+            if remaining_a == 0:
+                for cell in list(unknowns_a):
+                    self.mark_safe(cell)
+                continue
+            if remaining_a == len(unknowns_a):
+                found_mines.extend(unknowns_a)
+                for cell in list(unknowns_a):
+                    self.mark_mine(cell)
+                continue
+
+            overlapping = {b for cell in unknowns_a
+                           for b in self.neighbours[cell]
+                           if b != a and b in self.unknowns}
+            for b in overlapping:
+                unknowns_b = self.unknowns[b]
+                remaining_b = self.remaining[b]
+                only_a = unknowns_a - unknowns_b
+                only_b = unknowns_b - unknowns_a
+                if remaining_a - remaining_b == len(only_a):
+                    mines, safe = only_a, only_b
+                elif remaining_b - remaining_a == len(only_b):
+                    mines, safe = only_b, only_a
+                else:
+                    continue
+                if not (mines or safe):
+                    continue
+                found_mines.extend(mines)
+                for cell in mines:
+                    self.mark_mine(cell)
+                for cell in safe:
+                    self.mark_safe(cell)
+                break #  `a` has changed, it's back in self.dirty
+
+        return (np.fromiter(self.safe, dtype=np.intp, count=len(self.safe)),
+                np.array(found_mines, dtype=np.intp))
+
+    def solve(self) -> bool | None:
+        """
+        Reveal every safe cell that can be deduced, until the game
+        is over or no more progress can be made
+
+        Returns
+        -------
+        game_won: bool | None
+            True if the game was won, None if the solver got stuck
+        """
+        game = self.game
+        while game.game_won is None:
+            safe, _ = self.deduce()
+            if not len(safe):
+                break
+            for cell in safe.tolist():
+                if game.visible.flat[cell]:
+                    continue
+                coords = np.unravel_index(cell, game.shape)
+                revealed = game.reveal(coords)
+                self.update(np.ravel_multi_index(revealed, game.shape))
+            if game.check_win():
+                game.game_won = True
+        return game.game_won
@@ -0,0 +1,150 @@
+from typing import Tuple
+
+import numpy as np
+
+from sweeper.data.openings import label_openings
+from sweeper.solver.batch import BatchSolver, drop_repeats
+
+
+def largest_openings(labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the biggest opening of each grid, the safest place for a
+    first click
+
+    Parameters
+    ----------
+    labels: np.ndarray
+        The output of `label_openings`, shape (N, rows, columns)
+
+    Returns
+    -------
+    openings: np.ndarray
+        Label of each grid's largest opening, 0 if it has none
+    clicks: np.ndarray
+        Flat index of the first cell of that opening, -1 if none
+    """
+    N = len(labels)
+    flat = labels.reshape(N, -1)
+    num_labels = int(flat.max(initial=0)) + 1
+    cells = np.arange(N)[:, None] * num_labels + flat
+    sizes = np.bincount(cells.reshape(-1), minlength=N * num_labels)
+    sizes = sizes.reshape(N, num_labels)
+    sizes[:, 0] = 0
+    openings = sizes.argmax(axis=1)
+    clicks = np.where(openings > 0,
+                      np.argmax(flat == openings[:, None], axis=1), -1)
+    return openings, clicks
+
+
+def solve_without_guessing(grids: np.ndarray,
+                           solver: BatchSolver | None = None
+                           ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Play every grid from a click on its largest opening and find
+    the ones that can be cleared without ever guessing
+
+    Method
+    ------
+    All grids are played at once on the BatchSolver's padded
+    boards, keeping the mines left and unknowns around every cell
+    up to date rather than starting the solver afresh each move:
+    1. Click each grid's largest opening (`largest_openings`)
+    2. Reveal the clicked cells, plus the whole opening of any
+       that are 0s, as the game would, and count the mines left
+       and unknowns around each newly revealed number
+    3. Let the solver's rules find mines and safe cells among the
+       numbers near anything that changed
+    4. Click every safe cell found and go back to 2, until no
+       grid finds anything new. A grid is solvable if every safe
+       cell ends up revealed
+
+    Grids with no opening are never solvable, as any first click
+    could have been a mine.
+
+    Parameters
+    ----------
+    grids: np.ndarray
+        Grids with shape (N, rows, columns)
+    solver: BatchSolver | None
+        A solver for the grid shape, made if not given
+
+    Returns
+    -------
+    solvable: np.ndarray
+        bool array with shape (N,)
+    clicks: np.ndarray
+        The flat index of each grid's first click, -1 if it has
+        no opening
+    """
+    N = len(grids)
+    solver = solver or BatchSolver(grids.shape[1:])
+    labels = label_openings(grids)
+    openings, clicks = largest_openings(labels)
+
+    values = solver.padded(grids, 0)
+    labels = solver.padded(labels, 0)
+    padded_size = solver.padded_shape[0] * solver.padded_shape[1]
+    revealed = np.zeros(len(values), dtype=bool)
+    unknown = solver.padded(np.ones(grids.shape, dtype=bool), False)
+    remaining = np.zeros(len(values), dtype=np.int8)
+    unknown_around = np.zeros(len(values), dtype=np.int8)
+    seen = np.zeros(len(values), dtype=bool)
+
+    # Every opening's cells, sorted by opening, where each grid's
+    # openings are numbered apart from the other grids'
+    zero_cells = np.flatnonzero(labels)
+    num_labels = int(labels.max(initial=0)) + 1
+    opening_ids = zero_cells // padded_size * num_labels + labels[zero_cells]
+    order = np.argsort(opening_ids, kind="stable")
+    zero_cells, opening_ids = zero_cells[order], opening_ids[order]
+
+    def opening_cells(cells: np.ndarray) -> np.ndarray:
+        """The 0s of the openings containing the 0 `cells`"""
+        ids = np.unique(cells // padded_size * num_labels + labels[cells])
+        starts = np.searchsorted(opening_ids, ids, "left")
+        lengths = np.searchsorted(opening_ids, ids, "right") - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return zero_cells[offsets + np.arange(lengths.sum())]
+
+    grid_index = np.flatnonzero(openings)
+    click_rows, click_columns = np.divmod(clicks[grid_index], grids.shape[2])
+    new_safe = (grid_index * padded_size
+                + (click_rows + solver.pad) * solver.padded_shape[1]
+                + click_columns + solver.pad)
+    new_mines = np.empty(0, dtype=np.intp)
+    mines = np.zeros(len(values), dtype=bool)
+    while len(new_safe) or len(new_mines):
+        mines[new_mines] = True
+        unknown[new_mines] = False
+        for offset in solver.neighbours:
+            remaining[new_mines - offset] -= 1
+            unknown_around[new_mines - offset] -= 1
+
+        # Clicking a 0 reveals its opening and the numbers around it
+        zeros = new_safe[values[new_safe] == 0]
+        if len(zeros):
+            opened = opening_cells(zeros)
+            border = (opened[:, None] + solver.neighbours).reshape(-1)
+            new_safe = np.concatenate([new_safe, opened, border])
+        new_safe = drop_repeats(new_safe, seen)
+        new_safe = new_safe[unknown[new_safe]]
+
+        revealed[new_safe] = True
+        unknown[new_safe] = False
+        for offset in solver.neighbours:
+            unknown_around[new_safe - offset] -= 1
+        remaining[new_safe] = values[new_safe]
+        unknown_around[new_safe] = 0
+        for offset in solver.neighbours:
+            around = new_safe + offset
+            remaining[new_safe] -= mines[around]
+            unknown_around[new_safe] += unknown[around]
+
+        frontier = solver.near(np.concatenate([new_mines, new_safe]),
+                               revealed, unknown_around, seen)
+        new_mines, new_safe = solver.find(frontier, unknown, remaining,
+                                          revealed)
+
+    safe_cells = np.count_nonzero((grids >= 0).reshape(N, -1), axis=1)
+    cleared = np.count_nonzero(revealed.reshape(N, -1), axis=1) == safe_cells
+    return cleared & (openings > 0), clicks
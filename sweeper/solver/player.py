@@ -0,0 +1,109 @@
+from time import perf_counter
+from typing import Dict, List
+
+import numpy as np
+
+from sweeper.lad_sweeper import LadSweeper
+from sweeper.solver.probability import ProbabilityEngine
+
+
+class Player:
+    """
+    Plays a LadSweeper game to the end
+
+    Every cell the DeterministicSolver proves safe is clicked, and
+    when it's stuck the cell the ProbabilityEngine finds least
+    likely to be a mine is guessed (the first such cell on ties,
+    so the opening guess is the top left corner).
+
+    Time spent revealing cells and working out what to click is
+    added up in `timings`, and the time taken by each click,
+    counted from the end of the one before, is kept in
+    `move_times`.
+
+    >>> player = Player(LadSweeper((16, 30), 99, seed=0))
+    >>> won = player.play()
+    """
+    def __init__(self, game: LadSweeper):
+        """
+        Parameters
+        ----------
+        game: LadSweeper
+            The game to play, in progress or freshly started
+        """
+        self.game = game
+        self.engine = ProbabilityEngine(game)
+        self.solver = self.engine.solver
+        self.clicks = 0
+        self.guesses = 0
+        self.timings: Dict[str, float] = {"reveal": 0.0, "solve": 0.0}
+        self.move_times: List[float] = []
+
+    def guess(self) -> int:
+        """Return the flat index of the safest unrevealed cell"""
+        probabilities = self.engine.probabilities().reshape(-1)
+        probabilities[self.game.visible.reshape(-1) != 0] = np.inf
+        return int(np.argmin(probabilities))
+
+    def click(self, cell: int, certain: bool) -> None:
+        """
+        Click a cell and tell the solver what it revealed
+
+        Parameters
+        ----------
+        cell: int
+            Flat index of the cell
+        certain: bool
+            True if the cell is known to be safe, so it can go
+            straight to `LadSweeper.reveal`
+        """
+        game = self.game
+        coord = np.unravel_index(cell, game.shape)
+        start = perf_counter()
+        if certain:
+            revealed = np.ravel_multi_index(game.reveal(coord), game.shape)
+            if game.check_win():
+                game.game_won = True
+        else:
+            coords, _ = game.click(coord)
+            revealed = np.ravel_multi_index(coords, game.shape)
+        self.timings["reveal"] += perf_counter() - start
+        self.clicks += 1
+
+        if game.game_won is None:
+            start = perf_counter()
+            self.solver.update(revealed)
+            self.timings["solve"] += perf_counter() - start
+
+    def play(self) -> bool:
+        """
+        Click until the game is won or lost
+
+        Returns
+        -------
+        game_won: bool
+        """
+        game = self.game
+        visible = game.visible.reshape(-1)
+        last = perf_counter()
+        while game.game_won is None:
+            start = perf_counter()
+            safe, _ = self.solver.deduce()
+            certain = bool(len(safe))
+            if certain:
+                cells = safe.tolist()
+            else:
+                cells = [self.guess()]
+                self.guesses += 1
+            self.timings["solve"] += perf_counter() - start
+
+            for cell in cells:
+                if visible[cell]:
+                    continue
+                self.click(cell, certain)
+                now = perf_counter()
+                self.move_times.append(now - last)
+                last = now
+                if game.game_won is not None:
+                    break
+        return game.game_won
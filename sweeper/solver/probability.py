@@ -0,0 +1,239 @@
+from collections import OrderedDict, defaultdict
+from math import comb
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from sweeper.lad_sweeper import LadSweeper
+from sweeper.solver.deterministic import DeterministicSolver
+
+# One constraint: the unknown cells it covers and the mines among them
+Constraint = Tuple[Tuple[int, ...], int]
+# A component's key: its constraints, sorted
+ComponentKey = Tuple[Constraint, ...]
+
+
+def _polynomial_product(a: List[int], b: List[int]) -> List[int]:
+    """Multiply two polynomials given as coefficient lists"""
+    out = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                out[i + j] += x * y
+    return out
+
+
+class Component:
+    """
+    Every solution of one independent group of frontier
+    constraints, counted by how many mines they use
+
+    Cells that are in exactly the same constraints are
+    interchangeable, so they are grouped and given a number of
+    mines at once, weighted by the ways of placing them. Only the
+    groups are enumerated, with branches cut as soon as a
+    constraint can no longer be met.
+
+    Attributes
+    ----------
+    groups: list[tuple[int, ...]]
+        The cells of each group of interchangeable cells
+    weights: list[int]
+        weights[k] is the number of ways of placing k mines on the
+        component's cells that meet every constraint
+    mines: dict[int, list[int]]
+        mines[k][g] is the total number of mines in group g over
+        all of those ways of placing k mines
+    """
+    def __init__(self, key: ComponentKey):
+        memberships = defaultdict(list)
+        for index, (cells, _) in enumerate(key):
+            for cell in cells:
+                memberships[cell].append(index)
+        by_membership = defaultdict(list)
+        for cell, indices in memberships.items():
+            by_membership[tuple(indices)].append(cell)
+
+        # Order the groups so each constraint is finished as early
+        # as possible, which is where the pruning happens
+        groups = sorted(by_membership.items(), key=lambda item: item[0])
+        self.groups = [tuple(cells) for _, cells in groups]
+        group_constraints = [indices for indices, _ in groups]
+
+        need = [remaining for _, remaining in key]
+        left = [len(cells) for cells, _ in key]
+        sizes = [len(cells) for cells in self.groups]
+        counts = [0] * len(self.groups)
+        weights = defaultdict(int)
+        mines = defaultdict(lambda: [0] * len(self.groups))
+
+        def place(group: int, total: int, weight: int) -> None:
+            if group == len(self.groups):
+                weights[total] += weight
+                group_mines = mines[total]
+                for g, count in enumerate(counts):
+                    group_mines[g] += weight * count
+                return
+            size = sizes[group]
+            constraints = group_constraints[group]
+            for constraint in constraints:
+                left[constraint] -= size
+            for count in range(size + 1):
+                if all(0 <= need[c] - count <= left[c] for c in constraints):
+                    for c in constraints:
+                        need[c] -= count
+                    counts[group] = count
+                    place(group + 1, total + count,
+                          weight * comb(size, count))
+                    for c in constraints:
+                        need[c] += count
+            counts[group] = 0
+            for constraint in constraints:
+                left[constraint] += size
+
+        place(0, 0, 1)
+        top = max(weights, default=0)
+        self.weights = [weights.get(k, 0) for k in range(top + 1)]
+        self.mines = dict(mines)
+
+
+class ProbabilityEngine:
+    """
+    Exact mine probabilities for every unrevealed cell of a
+    LadSweeper game
+
+    Method
+    ------
+    1. Let a DeterministicSolver settle every certain cell
+    2. Split the remaining constraints into independent
+       components, connected by the cells they share
+    3. Count every component's solutions by number of mines used
+       (see Component). Components are cached by their
+       constraints, so one that a move didn't touch is reused
+    4. Weight each combination of components by the ways of
+       putting the rest of the game's mines on the unconstrained
+       interior cells, and sum to get each cell's probability
+
+    >>> engine = ProbabilityEngine(game)
+    >>> p = engine.probabilities() #  shape game.shape
+    After clicking, pass the revealed cells to `engine.solver.update`.
+    """
+    CACHE_SIZE = 512
+
+    def __init__(self, game: LadSweeper,
+                 solver: DeterministicSolver | None = None):
+        """
+        Parameters
+        ----------
+        game: LadSweeper
+            The game to work out the probabilities of
+        solver: DeterministicSolver | None
+            A solver already following the game, otherwise one is
+            made
+        """
+        self.game = game
+        self.solver = solver or DeterministicSolver(game)
+        self.cache: OrderedDict[ComponentKey, Component] = OrderedDict()
+
+    def component(self, key: ComponentKey) -> Component:
+        """Return the solutions of a component, cached by its key"""
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        component = Component(key)
+        self.cache[key] = component
+        if len(self.cache) > self.CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return component
+
+    def components(self) -> List[ComponentKey]:
+        """
+        Split the solver's constraints into independent groups
+        """
+        unknowns = self.solver.unknowns
+        parent: Dict[int, int] = {}
+
+        def find(cell: int) -> int:
+            while parent.setdefault(cell, cell) != cell:
+                parent[cell] = parent[parent[cell]]
+                cell = parent[cell]
+            return cell
+
+        for cells in unknowns.values():
+            first = find(next(iter(cells)))
+            for cell in cells:
+                parent[find(cell)] = first
+
+        groups = defaultdict(set)
+        for constraint, cells in unknowns.items():
+            cells = tuple(sorted(cells))
+            groups[find(cells[0])].add((cells, self.solver.remaining[constraint]))
+        return [tuple(sorted(group)) for group in groups.values()]
+
+    def probabilities(self) -> np.ndarray:
+        """
+        Return the probability of each cell being a mine
+
+        Revealed cells are 0 and cells known to be mines are 1.
+
+        Returns
+        -------
+        probabilities: np.ndarray
+            float array with shape game.shape
+        """
+        game = self.game
+        self.solver.deduce()
+        probabilities = np.zeros(game.size)
+        hidden = game.visible.reshape(-1) == 0
+
+        known_mines = list(self.solver.mines)
+        probabilities[known_mines] = 1
+        mines_left = game.num_mines - len(known_mines)
+
+        keys = self.components()
+        components = [self.component(key) for key in keys]
+        frontier = set().union(*(cells for key in keys
+                                 for cells, _ in key))
+        interior = hidden.copy()
+        interior[known_mines] = False
+        interior[list(frontier)] = False
+        interior[list(self.solver.safe)] = False
+        num_interior = int(np.count_nonzero(interior))
+
+        # The product of every other component's weights, for each
+        # component, from products of the ones before and after it
+        before = [[1]]
+        for component in components:
+            before.append(_polynomial_product(before[-1], component.weights))
+        after = [[1]]
+        for component in reversed(components):
+            after.append(_polynomial_product(after[-1], component.weights))
+        after.reverse()
+
+        def ways(mines: int) -> int:
+            """Ways to put `mines` on the interior"""
+            if 0 <= mines <= num_interior:
+                return comb(num_interior, mines)
+            return 0
+
+        total_weights = before[-1]
+        total = sum(w * ways(mines_left - k) for k, w in enumerate(total_weights))
+        if total == 0:
+            raise ValueError("the revealed board has no consistent mine layout")
+
+        if num_interior:
+            interior_mines = sum(w * ways(mines_left - k) * (mines_left - k)
+                                 for k, w in enumerate(total_weights))
+            probabilities[interior] = interior_mines / (num_interior * total)
+
+        for index, component in enumerate(components):
+            others = _polynomial_product(before[index], after[index + 1])
+            for k, group_mines in component.mines.items():
+                rest = sum(w * ways(mines_left - k - j)
+                           for j, w in enumerate(others))
+                if not rest:
+                    continue
+                for cells, count in zip(component.groups, group_mines):
+                    probabilities[list(cells)] += count * rest / (len(cells) * total)
+
+        return probabilities.reshape(game.shape)
@@ -0,0 +1,182 @@
+from typing import Tuple
+
+import numpy as np
+
+from sweeper.data.grid_generator import GridGenerator
+from sweeper.data.openings import dilate
+
+
+class VectorLadSweeper:
+    """
+    N games of lad-sweeper played in lock step, for RL agents and
+    solver rollouts
+
+    Every game's board and visibility are stacked
+    into (N, rows * columns) arrays and `step` applies one click
+    to every game in a single batch. Finished games are restarted
+    with fresh boards from `GridGenerator.generate_n_grids`:
+    >>> games = VectorLadSweeper(4096, (16, 30), 99, seed=0)
+    >>> obs = games.reset()
+    >>> obs, revealed, done, won = games.step(actions)
+
+    Observations are int8 boards with the counts of revealed cells
+    and `HIDDEN` everywhere else.
+    """
+    HIDDEN = 9
+
+    def __init__(self,
+                 num_games: int,
+                 shape: Tuple[int, int] = (16, 30),
+                 num_mines: int = 99,
+                 seed=None):
+        """
+        Parameters
+        ----------
+        num_games: int
+            Number of games played at once
+        shape: tuple[int, int]
+            Lad-sweeper grid shape
+        num_mines: int
+            Number of mines in each grid
+        seed: int | np.random.SeedSequence | None
+            Seed for the grid generator
+        """
+        self.num_games = num_games
+        self.shape = tuple(shape)
+        self.size = shape[0] * shape[1]
+        self.num_mines = num_mines
+        self.grid_generator = GridGenerator(self.shape, num_mines, seed=seed)
+
+        self.boards = np.empty((num_games, self.size), dtype=np.int8)
+        self.visible = np.empty((num_games, self.size), dtype=bool)
+        self.obs = np.empty((num_games, self.size), dtype=np.int8)
+        self.revealed = np.empty(num_games, dtype=np.int64)
+        self.safe_cells = self.size - num_mines
+        self.games = np.arange(num_games)
+
+        self.reset()
+
+    def reset(self, games: np.ndarray | None = None) -> np.ndarray:
+        """
+        Start new games, all of them if `games` is None
+
+        Parameters
+        ----------
+        games: np.ndarray | None
+            Indices, or a boolean mask, of the games to restart
+
+        Returns
+        -------
+        obs: np.ndarray
+            Observations of every game, shape (N, rows, columns)
+        """
+        if games is None:
+            games = self.games
+        elif games.dtype == bool:
+            games = np.flatnonzero(games)
+        if len(games):
+            grids = self.grid_generator.generate_n_grids(len(games))
+            self.boards[games] = grids.reshape(len(games), self.size)
+            self.visible[games] = False
+            self.obs[games] = self.HIDDEN
+            self.revealed[games] = 0
+        return self.obs.reshape(-1, *self.shape)
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray,
+                                                 np.ndarray, np.ndarray]:
+        """
+        Click one cell in every game
+
+        Parameters
+        ----------
+        actions: np.ndarray
+            Flat cell index clicked in each game, shape (N,), or
+            (row, column) pairs with shape (N, 2)
+
+        Returns
+        -------
+        obs: np.ndarray
+            Observations after the click, shape (N, rows, columns).
+            Games that finished have already been restarted, so
+            their observation is of the new game
+        revealed: np.ndarray
+            bool mask of the cells each click revealed, shape
+            (N, rows, columns)
+        done: np.ndarray
+            True for games that were won or lost by this click
+        won: np.ndarray
+            True for games that were won by this click
+        """
+        actions = np.asarray(actions)
+        if actions.ndim == 2:
+            actions = actions[:, 0] * self.shape[1] + actions[:, 1]
+        values = self.boards[self.games, actions]
+        fresh = ~self.visible[self.games, actions]
+
+        # Only the games that revealed something are touched below,
+        # so a step costs little more than the clicks themselves
+        revealed = np.zeros((self.num_games, self.size), dtype=bool)
+        numbers = np.flatnonzero(fresh & (values > 0))
+        cells = actions[numbers]
+        revealed[numbers, cells] = True
+        self.visible[numbers, cells] = True
+        self.obs[numbers, cells] = values[numbers]
+        self.revealed[numbers] += 1
+
+        zeros = np.flatnonzero(fresh & (values == 0))
+        if len(zeros):
+            opened = self.openings(zeros, actions[zeros])
+            opened &= ~self.visible[zeros]
+            revealed[zeros] = opened
+            self.visible[zeros] |= opened
+            obs = self.obs[zeros]
+            np.copyto(obs, self.boards[zeros], where=opened)
+            self.obs[zeros] = obs
+            self.revealed[zeros] += np.count_nonzero(opened, axis=1)
+
+        lost = values < 0
+        won = self.revealed == self.safe_cells
+        done = won | lost
+        if done.any():
+            self.reset(done)
+        return (self.obs.reshape(-1, *self.shape),
+                revealed.reshape(-1, *self.shape), done, won)
+
+    def openings(self, games: np.ndarray, cells: np.ndarray) -> np.ndarray:
+        """
+        Find the opening around a clicked 0 in each of `games`
+
+        Method
+        ------
+        1. Start from the clicked cell of each game
+        2. Grow every region by one cell in all directions at once,
+           keeping only 0s
+        3. Drop games whose region stopped growing and repeat on
+           the rest
+        4. Grow the finished regions once more to take in the
+           numbers on their border
+
+        Only games that clicked a 0 pay for this, and only for as
+        many rounds as their own opening needs, which is far less
+        work than labelling every opening of every new board.
+
+        Returns
+        -------
+        openings: np.ndarray
+            bool mask with shape (len(games), rows * columns)
+        """
+        regions = np.zeros((len(games), *self.shape), dtype=bool)
+        regions.reshape(len(games), -1)[np.arange(len(games)), cells] = True
+        zeros = self.boards[games].reshape(-1, *self.shape) == 0
+
+        growing = np.arange(len(games))
+        region = regions
+        while len(growing):
+            grown = dilate(region)
+            grown &= zeros
+            changed = (grown != region).reshape(len(growing), -1).any(axis=1)
+            regions[growing] = grown
+            growing = growing[changed]
+            region = grown[changed]
+            zeros = zeros[changed]
+        return dilate(regions).reshape(len(games), self.size)